@@ -1,4 +1,15 @@
 from .core import MavLinkMessageSeries, MavLog, MavTLog
 from .errors import EmptyLogError, PyMavLogError
+from .query import LogCatalog, diff_series
+from .summary import LogSummary
 
-__all__ = ["MavLog", "MavLinkMessageSeries", "EmptyLogError", "PyMavLogError", "MavTLog"]
+__all__ = [
+    "MavLog",
+    "MavLinkMessageSeries",
+    "EmptyLogError",
+    "PyMavLogError",
+    "MavTLog",
+    "LogSummary",
+    "LogCatalog",
+    "diff_series",
+]
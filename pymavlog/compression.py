@@ -0,0 +1,285 @@
+import gzip
+import io
+import lzma
+import math
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import typing as t
+
+from pymavlink import DFReader, mavutil
+
+from .errors import PyMavLogError
+
+CHUNK_SIZE = 4 * 1024 * 1024
+MAX_CHUNKS = 4
+
+EXTENSIONS = {".gz": "gz", ".xz": "xz", ".zst": "zst"}
+MAGIC_NUMBERS = {b"\x1f\x8b": "gz", b"\xfd7zXZ\x00": "xz", b"\x28\xb5\x2f\xfd": "zst"}
+
+LogSource = t.Union[str, os.PathLike, t.BinaryIO]
+
+
+def is_stream(source: LogSource) -> bool:
+    return not isinstance(source, (str, os.PathLike))
+
+
+def compression_of(source: LogSource) -> t.Optional[str]:
+    """
+    Returns the compression of a log file, from the extension of a path or
+    the magic number of a file-like object
+    """
+    if not is_stream(source):
+        return EXTENSIONS.get(os.path.splitext(os.fspath(source))[1].lower())
+    if hasattr(source, "peek"):
+        head = source.peek(6)[:6]
+    elif source.seekable():
+        pos = source.tell()
+        head = source.read(6)
+        source.seek(pos)
+    else:
+        return None
+    for magic, kind in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def inner_extension(source: LogSource) -> str:
+    """
+    Returns the extension of a log once decompressed, e.g. ".log" for "foo.log.gz",
+    from the path or the name of a file object
+    """
+    name = getattr(source, "name", None) if is_stream(source) else os.fspath(source)
+    if not isinstance(name, str):
+        return ""
+    root, ext = os.path.splitext(name)
+    if ext.lower() in EXTENSIONS:
+        ext = os.path.splitext(root)[1]
+    return ext.lower()
+
+
+def _open_zstd(source: LogSource) -> t.BinaryIO:
+    try:
+        import zstandard
+    except ImportError:
+        raise PyMavLogError("zstandard is required to read .zst logs: pip install zstandard")
+    owned = not is_stream(source)
+    fh = open(source, "rb") if owned else source
+    return zstandard.ZstdDecompressor().stream_reader(fh, read_size=CHUNK_SIZE, closefd=owned)
+
+
+OPENERS: t.Dict[str, t.Callable[[LogSource], t.BinaryIO]] = {
+    "gz": lambda source: gzip.open(source, "rb"),
+    "xz": lambda source: lzma.open(source, "rb"),
+    "zst": _open_zstd,
+}
+
+
+def open_source(source: LogSource) -> t.BinaryIO:
+    """
+    Opens a log path or file-like object, decompressing it on the fly if needed.
+    Uncompressed file-like objects are returned as they are.
+    """
+    kind = compression_of(source)
+    if kind is not None:
+        return OPENERS[kind](source)
+    return source if is_stream(source) else open(source, "rb")
+
+
+class BackgroundReader(io.RawIOBase):
+    """
+    Read-only stream that fills large buffers from another stream on a
+    background thread, so decompression overlaps with decoding. It is not
+    seekable, `tell` reports the decompressed bytes read so far.
+    """
+
+    def __init__(
+        self,
+        stream: t.BinaryIO,
+        chunk_size: int = CHUNK_SIZE,
+        max_chunks: int = MAX_CHUNKS,
+        close_stream: bool = True,
+    ) -> None:
+        super().__init__()
+        self._stream = stream
+        self._close_stream = close_stream
+        self._chunk_size = chunk_size
+        self._chunks: queue.Queue = queue.Queue(maxsize=max_chunks)
+        self._chunk = b""
+        self._offset = 0
+        self._pos = 0
+        self._eof = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, name="pymavlog-read", daemon=True)
+        self._thread.start()
+
+    def _fill(self) -> None:
+        try:
+            while not self._stop.is_set():
+                chunk = self._stream.read(self._chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    return None
+        except BaseException as e:
+            self._put(e)
+
+    def _put(self, item) -> None:
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return None
+            except queue.Full:
+                continue
+
+    def _next_chunk(self) -> bool:
+        if self._eof:
+            return False
+        item = self._chunks.get()
+        if isinstance(item, BaseException):
+            self._eof = True
+            raise item
+        if not item:
+            self._eof = True
+            return False
+        self._chunk = item
+        self._offset = 0
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return self.readall()
+        parts = []
+        while size > 0:
+            available = len(self._chunk) - self._offset
+            if available == 0:
+                if not self._next_chunk():
+                    break
+                continue
+            start = self._offset
+            end = start + min(size, available)
+            parts.append(self._chunk[start:end])
+            self._offset = end
+            size -= end - start
+        data = parts[0] if len(parts) == 1 else b"".join(parts)
+        self._pos += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        parts = []
+        while True:
+            data = self.read(self._chunk_size)
+            if not data:
+                return b"".join(parts)
+            parts.append(data)
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if self.closed:
+            return None
+        self._stop.set()
+        self._thread.join()
+        if self._close_stream:
+            self._stream.close()
+        super().close()
+
+
+def _memory_file() -> t.BinaryIO:
+    """
+    An anonymous in-memory file where available, an unlinked temporary file otherwise
+    """
+    if hasattr(os, "memfd_create"):
+        return os.fdopen(os.memfd_create("pymavlog"), "w+b")
+    return tempfile.TemporaryFile()
+
+
+def open_dataflash(source: LogSource, zero_time_base: bool = False) -> DFReader.DFReader:
+    """
+    Opens a compressed or file-like DataFlash log, as a text log when its
+    decompressed name ends with ".log" and as a binary log otherwise. pymavlink
+    indexes every record before the first message can be read, so the
+    decompressed data is written to an anonymous memory file that it can mmap,
+    instead of being streamed.
+    """
+    reader = (
+        DFReader.DFReader_text if inner_extension(source) == ".log" else DFReader.DFReader_binary
+    )
+    buffer = _memory_file()
+    stream = open_source(source)
+    try:
+        shutil.copyfileobj(stream, buffer, CHUNK_SIZE)
+    finally:
+        # file-like objects given by the caller are left open
+        if stream is not source:
+            stream.close()
+    buffer.flush()
+    fd = os.dup(buffer.fileno())
+    buffer.close()
+    return reader(fd, zero_time_base=zero_time_base)
+
+
+class StreamLogFile(mavutil.mavlogfile):
+    """
+    Telemetry log reader on top of a stream, as `mavutil.mavlogfile` only
+    accepts file names
+    """
+
+    def __init__(
+        self,
+        stream: t.BinaryIO,
+        name: str = "<stream>",
+        robust_parsing: bool = True,
+        notimestamps: bool = False,
+        source_system: int = 255,
+        source_component: int = 0,
+        use_native: bool = mavutil.default_native,
+    ):
+        self.filename = name
+        self.writeable = False
+        self.robust_parsing = robust_parsing
+        self.planner_format = None
+        self._two64 = math.pow(2.0, 63)
+        self.f = stream
+        # the decompressed size is unknown, this disables the percent counter
+        self.filesize = 0
+        self.percent = 0
+        mavutil.mavfile.__init__(
+            self,
+            None,
+            name,
+            source_system=source_system,
+            source_component=source_component,
+            notimestamps=notimestamps,
+            use_native=use_native,
+        )
+        if self.notimestamps:
+            self._timestamp = 0
+        else:
+            self._timestamp = time.time()
+        self.stop_on_EOF = True
+        self._last_message = None
+        self._last_timestamp = None
+        self._link = 0
+
+
+def open_telemetry(source: LogSource) -> StreamLogFile:
+    """
+    Opens a compressed or file-like telemetry log, decompressing it on a
+    background thread while messages are decoded
+    """
+    name = "<stream>" if is_stream(source) else os.fspath(source)
+    stream = open_source(source)
+    return StreamLogFile(BackgroundReader(stream, close_stream=stream is not source), name=name)
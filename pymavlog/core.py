@@ -1,12 +1,23 @@
+import os
+import threading
 import typing as t
+import weakref
+from concurrent.futures import Executor
 from datetime import datetime
 
 import numpy as np
 from pymavlink import mavutil
-from pymavlink.DFReader import DFFormat, DFMessage
+from pymavlink.DFReader import DFFormat, DFMessage, DFReader_text
 from pymavlink.dialects.v20.ardupilotmega import MAVLink_message
 
-from .errors import EmptyLogError, InvalidFormatError
+from .compression import LogSource, compression_of, is_stream, open_dataflash, open_telemetry
+from .errors import EmptyLogError, InvalidFormatError, PyMavLogError
+from .futures import ParseFuture
+from .lod import MinMaxPyramid
+from .schema import SeriesSchema
+from .segments import SEGMENT_MESSAGES, Segment, SegmentIndex
+from .summary import LogSummary, inspect_log
+from .units import UNIT_MESSAGES, UnitTable
 
 
 class MavLinkMessageSeries(object):
@@ -36,24 +47,34 @@ class MavLinkMessageSeries(object):
         msg_id: int = 1,
         convert_to_datetime: bool = False,
         max_rate_hz: int = None,
+        projected: bool = False,
     ) -> None:
-        self.name = name
-        self.id = msg_id
-        self._to_datetime = convert_to_datetime
-        self._column_alias = column_alias
-
         if len(columns) != len(types):
             raise InvalidFormatError("columns and types must have the same length")
 
-        self._columns = ["timestamp"]
-        if self._to_datetime:
-            self._types = [datetime]
-        else:
-            self._types = [float]
+        schema = SeriesSchema(name, columns, types, column_alias, convert_to_datetime)
+        self._setup(schema, msg_id, max_rate_hz, projected)
 
-        self._columns.extend(columns)
-        self._types.extend(types)
-        self._fields: t.Dict[str, t.List[t.Union[datetime, int, float]]] = {}
+    def _setup(
+        self,
+        schema: SeriesSchema,
+        msg_id: int = 1,
+        max_rate_hz: int = None,
+        projected: bool = False,
+    ) -> None:
+        self.name = schema.name
+        self.id = msg_id
+        self._schema = schema
+        self._to_datetime = schema.convert_to_datetime
+        self._column_alias = schema.column_alias
+        self._projected = projected
+        if projected:
+            self._msg_pairs = schema.msg_pairs
+
+        self._units: t.Dict[str, str] = {}
+        self._multipliers: t.Dict[str, float] = {}
+        self._lod: t.Dict[str, MinMaxPyramid] = {}
+        self._fields_cache: t.Optional[t.Tuple[tuple, t.Dict[str, np.ndarray]]] = None
 
         self._set_series()
 
@@ -94,12 +115,42 @@ class MavLinkMessageSeries(object):
         return True
 
     def _set_series(self):
-        for c in self._columns:
-            self._fields[self._column_alias.get(c, c)] = []
+        self._fields: t.Dict[str, t.List[t.Union[datetime, int, float]]] = {
+            key: [] for key in self._schema.keys
+        }
 
     @property
     def columns(self) -> t.List[str]:
-        return self._columns
+        # a copy, so callers cannot alter the layout of the series
+        return list(self._schema.columns)
+
+    @staticmethod
+    def _project(
+        columns: t.List[str], types: t.List[type], keep: t.Optional[t.List[str]]
+    ) -> t.Tuple[t.List[str], t.List[type]]:
+        """
+        Keeps only the columns (and their types) listed in `keep`, in message order
+        """
+        if keep is None:
+            # SeriesSchema copies them
+            return columns, types
+        unknown = [c for c in keep if c not in columns]
+        if unknown:
+            raise InvalidFormatError(f"unknown columns {unknown}, expected any of {list(columns)}")
+        pairs = [(c, ty) for c, ty in zip(columns, types) if c in keep]
+        return [c for c, _ in pairs], [ty for _, ty in pairs]
+
+    @classmethod
+    def from_schema(
+        cls,
+        schema: SeriesSchema,
+        msg_id: int = 1,
+        max_rate_hz: int = None,
+        projected: bool = False,
+    ):
+        series = cls.__new__(cls)
+        series._setup(schema, msg_id, max_rate_hz, projected)
+        return series
 
     @classmethod
     def from_df_format(
@@ -109,16 +160,11 @@ class MavLinkMessageSeries(object):
         msg_id: int = 1,
         convert_to_datetime: bool = False,
         max_rate_hz: int = None,
+        columns: t.List[str] = None,
     ):
-        return cls(
-            name=fmt.name,
-            columns=fmt.columns,
-            types=fmt.msg_types,
-            column_alias=column_alias,
-            msg_id=msg_id,
-            convert_to_datetime=convert_to_datetime,
-            max_rate_hz=max_rate_hz,
-        )
+        msg_columns, msg_types = cls._project(fmt.columns, fmt.msg_types, columns)
+        schema = SeriesSchema(fmt.name, msg_columns, msg_types, column_alias, convert_to_datetime)
+        return cls.from_schema(schema, msg_id, max_rate_hz, projected=columns is not None)
 
     @classmethod
     def from_message(
@@ -128,32 +174,135 @@ class MavLinkMessageSeries(object):
         msg_id: int = 1,
         convert_to_datetime: bool = False,
         max_rate_hz: int = None,
+        columns: t.List[str] = None,
     ):
         msg_types = list(map(lambda x: cls.MSG_TYPES[x], msg.fieldtypes))
-        columns = msg.get_fieldnames()
-        name = msg.msgname
-        return cls(
-            name=name,
-            columns=columns,
-            types=msg_types,
-            column_alias=column_alias,
-            msg_id=msg_id,
-            convert_to_datetime=convert_to_datetime,
-            max_rate_hz=max_rate_hz,
+        msg_columns, msg_types = cls._project(msg.get_fieldnames(), msg_types, columns)
+        schema = SeriesSchema(
+            msg.msgname, msg_columns, msg_types, column_alias, convert_to_datetime
         )
+        return cls.from_schema(schema, msg_id, max_rate_hz, projected=columns is not None)
 
     @property
     def fields(self) -> t.Dict[str, np.ndarray]:
         """
         The timeseries fields as a numpy array
         """
-        fields_np = {}
-        for idx, c in enumerate(self._columns):
-            fields_np[self._column_alias.get(c, c)] = np.array(
-                object=self._fields[self._column_alias.get(c, c)],
-                dtype=self._types[idx],
-            )
-        return fields_np
+        return {
+            key: self._to_numpy(key, dtype)
+            for key, dtype in zip(self._schema.keys, self._schema.types)
+        }
+
+    def _to_numpy(self, key: str, dtype: type) -> np.ndarray:
+        mult = self._multipliers.get(key)
+        if mult is None:
+            return np.array(object=self._fields[key], dtype=dtype)
+        if 0.0 < mult < 1.0:
+            # dividing by 1e2 or 1e7 is more accurate than multiplying by 1e-2 or 1e-7
+            return np.array(object=self._fields[key], dtype=float) / (1.0 / mult)
+        return np.array(object=self._fields[key], dtype=float) * mult
+
+    @property
+    def units(self) -> t.Dict[str, str]:
+        """
+        The unit of each column, for logs parsed with `apply_units`
+        """
+        return self._units
+
+    def set_units(self, units: t.Dict[str, str], multipliers: t.Dict[str, float]) -> None:
+        """
+        Attaches units to the columns and sets the multipliers applied to them
+        when converting to numpy arrays
+        """
+        self._units = {
+            self._column_alias.get(c, c): u for c, u in units.items() if c in self._schema.columns
+        }
+        self._multipliers = {
+            self._column_alias.get(c, c): m
+            for c, m in multipliers.items()
+            if c in self._schema.columns
+        }
+        # converted arrays and level of detail indexes hold the unscaled values
+        self._fields_cache = None
+        self._lod = {}
+
+    def _cached_fields(self) -> t.Dict[str, np.ndarray]:
+        """
+        The numpy fields, converted once and reused until the series changes
+        """
+        size = (len(self._fields["timestamp"]), len(self._fields[self._schema.keys[-1]]))
+        if self._fields_cache is None or self._fields_cache[0] != size:
+            self._fields_cache = (size, self.fields)
+        return self._fields_cache[1]
+
+    def slice(self, t0=None, t1=None) -> t.Dict[str, np.ndarray]:
+        """
+        Returns the fields with a timestamp in [t0, t1), as views of the numpy
+        arrays found by binary search on the timestamps
+
+        ----
+        Parameters
+        ----
+
+            t0: start of the interval, the start of the series if None
+            t1: end of the interval (excluded), the end of the series if None
+
+        ----
+        Returns
+        ----
+            Dict[str, np.ndarray]
+        """
+        fields = self._cached_fields()
+        timestamps = fields["timestamp"]
+        if self._to_datetime:
+            t0 = datetime.fromtimestamp(t0) if isinstance(t0, (int, float)) else t0
+            t1 = datetime.fromtimestamp(t1) if isinstance(t1, (int, float)) else t1
+        i0 = 0 if t0 is None else int(np.searchsorted(timestamps, t0, "left"))
+        i1 = len(timestamps) if t1 is None else int(np.searchsorted(timestamps, t1, "left"))
+        return {key: values[i0:i1] for key, values in fields.items()}
+
+    def build_lod(self, columns: t.List[str] = None) -> None:
+        """
+        Builds the min/max/mean level of detail index of the given columns,
+        all numeric columns if not given
+        """
+        dtypes = dict(zip(self._schema.keys, self._schema.types))
+        timestamps = self._to_numpy("timestamp", dtypes["timestamp"])
+        for key, dtype in dtypes.items():
+            if key == "timestamp" or (columns is not None and key not in columns):
+                continue
+            # only the indexed columns are converted to numpy
+            values = self._to_numpy(key, dtype)
+            if columns is None and not np.issubdtype(values.dtype, np.number):
+                continue
+            self._lod[key] = MinMaxPyramid(timestamps, values)
+
+    def render(
+        self, column: str, t0=None, t1=None, pixels: int = 1000
+    ) -> t.Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns about 2 * pixels (timestamp, value) points to plot a column
+        between t0 and t1, using the level of detail index
+
+        ----
+        Parameters
+        ----
+
+            column (str): The name of the column
+            t0: start of the window, the start of the series if None
+            t1: end of the window (excluded), the end of the series if None
+            pixels (int): horizontal resolution of the plot
+
+        ----
+        Returns
+        ----
+            timestamps and values as numpy arrays
+        """
+        lod = self._lod.get(column)
+        if lod is None or len(lod) != len(self._fields[column]):
+            self.build_lod([column])
+            lod = self._lod[column]
+        return lod.render(t0, t1, pixels)
 
     @property
     def raw_fields(self) -> t.Dict[str, list]:
@@ -163,8 +312,13 @@ class MavLinkMessageSeries(object):
         return self._fields
 
     def append_message(self, message: DFMessage) -> None:
-        msg_dict = message.to_dict()
-        msg_type = msg_dict["mavpackettype"]
+        if self._projected:
+            # only the projected fields are extracted, the decoder resolves
+            # each attribute lazily so the rest of the payload is never converted
+            msg_type = message.get_type()
+        else:
+            msg_dict = message.to_dict()
+            msg_type = msg_dict.pop("mavpackettype")
 
         if msg_type != self.name:
             raise ValueError(f"Invalid message type, got {msg_type}, expected {self.name}")
@@ -174,14 +328,17 @@ class MavLinkMessageSeries(object):
 
         timestamp = getattr(message, "_timestamp", None)
 
-        msg_dict.pop("mavpackettype")
-
         if timestamp:
             if self._to_datetime:
                 self._fields["timestamp"].append(datetime.fromtimestamp(timestamp))
             else:
                 self._fields["timestamp"].append(timestamp)
 
+        if self._projected:
+            for column, key in self._msg_pairs:
+                self._fields[key].append(getattr(message, column))
+            return None
+
         for k, v in msg_dict.items():
             self._fields[self._column_alias.get(k, k)].append(v)
 
@@ -190,17 +347,27 @@ class MavLinkMessageSeries(object):
 
 
 class MavLogBase(object):
+    # kind of log walked by `inspect_log`, None when it cannot be inspected
+    _log_kind: t.Optional[str] = None
+
     def __init__(
         self,
-        filepath: str,
+        filepath: LogSource,
         messages_to_ignore: t.List[str] = ["FMT", "FMTU"],
         types: t.List[str] = None,
         to_datetime: bool = False,
         map_columns: t.Dict[str, str] = {},
         max_rate_hz: float = None,
+        columns: t.Dict[str, t.List[str]] = None,
     ):
         self._messages_ignore = messages_to_ignore
-        self._mlog: mavutil.mavserial = mavutil.mavlink_connection(filepath)
+        self._filepath = filepath
+        # compressed files and file-like objects cannot be memory mapped by pymavlink
+        self._streamed = is_stream(filepath) or compression_of(filepath) is not None
+        self._mlog: mavutil.mavserial = self._connect(filepath)
+        # compressed telemetry logs are read by a background thread, which is
+        # stopped when the log is closed or garbage collected
+        self._finalizer = weakref.finalize(self, self._mlog.close)
 
         self._parsed_data: t.Dict[str, MavLinkMessageSeries] = {}
         self._msg_count = 0
@@ -208,7 +375,34 @@ class MavLogBase(object):
         self._map_columns = map_columns
         self._start_timestamp = None
         self._end_timestamp = None
+        # first timestamp of any record, whatever the types filter
+        self._first_timestamp = None
         self._max_rate_hz = max_rate_hz
+        self._columns = columns or {}
+        self._unit_table: t.Optional[UnitTable] = None
+        self._discover_types = False
+        self._segment_index = SegmentIndex()
+
+    def _connect(self, filepath: LogSource) -> mavutil.mavfile:
+        return mavutil.mavlink_connection(filepath)
+
+    def _add_type(self, message: DFMessage) -> bool:
+        """
+        Creates the series of a message type first seen while parsing
+        """
+        return False
+
+    def close(self) -> None:
+        """
+        Closes the log file, the parsed series remain available
+        """
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def __getitem__(self, item: str) -> MavLinkMessageSeries:
         return self._parsed_data[item]
@@ -243,15 +437,161 @@ class MavLogBase(object):
         """
         Parses the log file in-memory
         """
+        self._parse()
+
+    def parse_async(self, executor: Executor = None) -> ParseFuture:
+        """
+        Parses the log file in-memory in the background
+
+        ----
+        Parameters
+        ----
+
+            executor (Executor): a thread based executor to run the parse on,
+                a dedicated daemon thread is started if not given
+
+        ----
+        Returns
+        ----
+            ParseFuture, resolving to this log object. Cancelling it closes the log.
+        """
+        future = ParseFuture(total_bytes=self._file_size())
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                self.close()
+                return
+            try:
+                self._parse(future)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                if future.cancel_requested:
+                    self.close()
+                    future._stop()
+                else:
+                    future.set_result(self)
+
+        if executor is not None:
+            executor.submit(run)
+        else:
+            threading.Thread(target=run, name="pymavlog-parse", daemon=True).start()
+        return future
+
+    PROGRESS_INTERVAL = 1000
+
+    def _file_size(self) -> t.Optional[int]:
+        if self._streamed:
+            data_len = getattr(self._mlog, "data_len", None)
+            return data_len if isinstance(data_len, int) else None
+        try:
+            return os.path.getsize(self._filepath)
+        except (OSError, TypeError):
+            return None
+
+    def _bytes_processed(self) -> t.Optional[int]:
+        offset = getattr(self._mlog, "offset", None)
+        if isinstance(offset, int):
+            return offset
+        try:
+            offset = self._mlog.f.tell()
+        except (AttributeError, OSError, ValueError):
+            return None
+        return offset if isinstance(offset, int) else None
+
+    def _expected_counts(self) -> t.Optional[t.Dict[str, int]]:
+        """
+        Record count per message type, used to know when a type is fully parsed
+        """
+        if self._streamed or self._log_kind is None:
+            return None
+        try:
+            return inspect_log(self._filepath, self._log_kind).counts
+        except (OSError, TypeError, ValueError, PyMavLogError):
+            return None
+
+    def _apply_units(self):
+        """
+        Applies the unit table collected while parsing, logs without units
+        have nothing to apply
+        """
+        return None
+
+    def _instance_column(self, name: str) -> t.Optional[str]:
+        """
+        Returns the series key of the instance field of a message, None for
+        messages logged as a single instance
+        """
+        return None
+
+    def _pending_counts(self, future: ParseFuture) -> t.Dict[str, int]:
+        """
+        Records left to parse per message type, types without records are
+        published as completed right away
+        """
+        pending: t.Dict[str, int] = {}
+        # with units, series are only final once the unit table is applied
+        if self._unit_table is not None:
+            return pending
+        expected = self._expected_counts()
+        if expected is None:
+            return pending
+        for name in self._types:
+            pending[name] = expected.get(name, 0)
+            if pending[name] == 0:
+                future._complete_type(name)
+        return pending
+
+    @staticmethod
+    def _expect_record(pending: t.Dict[str, int], future: ParseFuture, name: str) -> None:
+        if pending.get(name) == 0:
+            # more records than inspect counted, none of the counts can be trusted
+            # anymore: types are only published as completed at the end of the parse
+            pending.clear()
+            future._revoke_completed()
+
+    @staticmethod
+    def _mark_parsed(pending: t.Dict[str, int], future: ParseFuture, name: str) -> None:
+        left = pending.get(name)
+        if left is None:
+            return None
+        pending[name] = left - 1
+        if left == 1:
+            # last record of this type, no more appends to its series
+            future._complete_type(name)
+
+    def _parse(self, future: ParseFuture = None):
         message: DFMessage
 
+        pending = self._pending_counts(future) if future is not None else {}
+        records = 0
+
         while True:
             message = self._mlog.recv_msg()
 
             if message is None:
                 break
 
-            if message.get_type() not in self._types:
+            if future is not None:
+                records += 1
+                if records % self.PROGRESS_INTERVAL == 0:
+                    future._update(self._bytes_processed(), records)
+                    if future.cancel_requested:
+                        return None
+
+            if self._unit_table is not None and message.get_type() in UNIT_MESSAGES:
+                self._unit_table.add_message(message)
+
+            if message.get_type() in SEGMENT_MESSAGES:
+                self._segment_index.add_message(message, self._mlog)
+
+            if self._first_timestamp is None:
+                # records before the first timestamped one carry 0
+                self._first_timestamp = getattr(message, "_timestamp", None) or None
+
+            if message.get_type() not in self._types and not (
+                self._discover_types and self._add_type(message)
+            ):
                 continue
 
             message: DFMessage
@@ -262,9 +602,49 @@ class MavLogBase(object):
             if timestamp is not None and (self._msg_count == 0 or not self._start_timestamp):
                 self._start_timestamp = timestamp
 
+            if pending:
+                self._expect_record(pending, future, message.get_type())
+
             self._parsed_data[message.get_type()].append_message(message)
             self._msg_count += 1
 
+            if pending:
+                self._mark_parsed(pending, future, message.get_type())
+
+        if self._unit_table is not None:
+            self._apply_units()
+
+        if future is not None:
+            future._update(self._file_size(), records)
+            for name in self._types:
+                future._complete_type(name)
+
+    def segments(self, mode: str = None, armed: bool = None) -> t.List[Segment]:
+        """
+        Returns the time segments of the log, built from its MODE, ARM and EV
+        records, optionally filtered by flight mode and arming state
+
+        ----
+        Parameters
+        ----
+
+            mode (str): The flight mode name, e.g. "AUTO"
+            armed (bool): The arming state
+
+        ----
+        Returns
+        ----
+            List[Segment]
+        """
+        return self._segment_index.select(self, mode=mode, armed=armed)
+
+    @property
+    def events(self) -> t.List[t.Tuple[float, int]]:
+        """
+        The (timestamp, id) of every EV record
+        """
+        return self._segment_index.events
+
     def get(self, key: str):
         """
         Returns a MavLinkMessageSeries object for the given key
@@ -286,16 +666,24 @@ class MavLogBase(object):
 class MavLog(MavLogBase):
     """
     A Mavlink binary log object
+
+    Compressed logs and file objects are decompressed in full when the object
+    is created, into an anonymous memory file (a temporary file on platforms
+    without memfd_create), so they use as much RAM as the decompressed log.
     """
 
+    _log_kind = "bin"
+
     def __init__(
         self,
-        filepath: str,
+        filepath: LogSource,
         messages_to_ignore: t.List[str] = ["FMT", "FMTU"],
         types: t.List[str] = None,
         to_datetime: bool = False,
         map_columns: t.Dict[str, str] = {},
         max_rate_hz: float = None,
+        columns: t.Dict[str, t.List[str]] = None,
+        apply_units: bool = False,
     ):
         super().__init__(
             filepath=filepath,
@@ -304,22 +692,76 @@ class MavLog(MavLogBase):
             to_datetime=to_datetime,
             map_columns=map_columns,
             max_rate_hz=max_rate_hz,
+            columns=columns,
         )
 
+        if apply_units:
+            self._unit_table = UnitTable()
+
         self._set_parsed_data(types)
 
+    def _connect(self, filepath: LogSource) -> mavutil.mavfile:
+        if self._streamed:
+            return open_dataflash(filepath)
+        return super()._connect(filepath)
+
+    @classmethod
+    def inspect(cls, filepath: str) -> LogSummary:
+        """
+        Returns the message types, counts, first/last TimeUS and FMT schema
+        of a binary log without decoding any payload
+        """
+        return inspect_log(filepath, cls._log_kind)
+
+    def _expected_counts(self) -> t.Optional[t.Dict[str, int]]:
+        # inspect only walks binary records
+        if isinstance(self._mlog, DFReader_text):
+            return None
+        return super()._expected_counts()
+
+    def _format(self, name: str, msg_id: int) -> DFFormat:
+        # binary readers key the formats by message id, text readers by name
+        formats = self._mlog.formats
+        return formats[msg_id] if msg_id in formats else formats[name]
+
+    def _apply_units(self):
+        """
+        Scales every series with the FMTU multipliers and attaches the units
+        """
+        for series in self._parsed_data.values():
+            fmt = self._format(series.name, series.id)
+            series.set_units(*self._unit_table.columns_for(fmt))
+
+    def _instance_column(self, name: str) -> t.Optional[str]:
+        series = self._parsed_data.get(name)
+        if series is None:
+            return None
+        field = self._format(name, series.id).instance_field
+        if field is None:
+            return None
+        return self._map_columns.get(field, field)
+
     def _set_parsed_data(self, types: t.List[str]):
         self._types = []
         for name, msg_id in self._mlog.name_to_id.items():
-            fmt = self._mlog.formats[msg_id]
+            fmt = self._format(name, msg_id)
             msg_not_in_types = (types is not None) and (name not in types)
             ignore_type = (name in self._messages_ignore) or msg_not_in_types
             if ignore_type:
                 continue
 
+            projection = self._columns.get(name)
+            if projection is not None and fmt.instance_field not in (None, *projection):
+                # without its instance field a multi-instance message cannot be split
+                projection = [fmt.instance_field, *projection]
             self._types.append(fmt.name)
             self._parsed_data[name] = MavLinkMessageSeries.from_df_format(
-                fmt, self._map_columns, msg_id, self._to_datetime, self._max_rate_hz
+                fmt,
+                self._map_columns,
+                msg_id,
+                self._to_datetime,
+                self._max_rate_hz,
+                projection,
             )
         if not self._types:
             raise EmptyLogError("The log contains no message types")
@@ -330,14 +772,17 @@ class MavTLog(MavLogBase):
     A MavLink Telemetry log object
     """
 
+    _log_kind = "tlog"
+
     def __init__(
         self,
-        filepath: str,
+        filepath: LogSource,
         messages_to_ignore: t.List[str] = ["HEARTBEAT", "MAV"],
         types: t.List[str] = None,
         to_datetime: bool = False,
         map_columns: t.Dict[str, str] = {},
         max_rate_hz: float = None,
+        columns: t.Dict[str, t.List[str]] = None,
     ):
         super().__init__(
             filepath=filepath,
@@ -345,24 +790,67 @@ class MavTLog(MavLogBase):
             types=types,
             to_datetime=to_datetime,
             map_columns=map_columns,
+            columns=columns,
         )
 
         self.__set_parsed_data(types)
 
+    def _connect(self, filepath: LogSource) -> mavutil.mavfile:
+        if self._streamed:
+            return open_telemetry(filepath)
+        return super()._connect(filepath)
+
+    def _accepts(self, name: str) -> bool:
+        msg_not_in_types = (self._requested_types is not None) and (
+            name not in self._requested_types
+        )
+        return not ((name in self._messages_ignore) or msg_not_in_types)
+
+    def _add_type(self, message: MAVLink_message) -> bool:
+        name = message.get_type()
+        if name == "BAD_DATA" or name in self._parsed_data or not self._accepts(name):
+            return False
+        self._types.append(name)
+        self._parsed_data[name] = MavLinkMessageSeries.from_message(
+            message,
+            self._map_columns,
+            message.get_msgId(),
+            self._to_datetime,
+            self._max_rate_hz,
+            self._columns.get(name),
+        )
+        return True
+
+    @classmethod
+    def inspect(cls, filepath: str) -> LogSummary:
+        """
+        Returns the message types, counts and first/last timestamps
+        of a telemetry log without decoding any payload
+        """
+        return inspect_log(filepath, cls._log_kind)
+
     def __set_parsed_data(self, types: t.List[str]):
         self._types = []
+        self._requested_types = types
+        if self._streamed:
+            # the message types of a stream are only known while it is parsed
+            self._discover_types = True
+            return None
         for name, msg_id in self._mlog.name_to_id.items():
             msg = self._mlog.messages.get(name)
             if msg is None:
                 continue
-            msg_not_in_types = (types is not None) and (name not in types)
-            ignore_type = (name in self._messages_ignore) or msg_not_in_types
-            if ignore_type:
+            if not self._accepts(name):
                 continue
 
             self._types.append(name)
             self._parsed_data[name] = MavLinkMessageSeries.from_message(
-                msg, self._map_columns, msg_id, self._to_datetime, self._max_rate_hz
+                msg,
+                self._map_columns,
+                msg_id,
+                self._to_datetime,
+                self._max_rate_hz,
+                self._columns.get(name),
             )
         if not self._types:
             raise EmptyLogError("The log contains no message types")
@@ -0,0 +1,109 @@
+import threading
+import time
+import typing as t
+from concurrent.futures import CancelledError, Future
+
+
+class ParseProgress(object):
+    """
+    Snapshot of the progress of a background parse
+    """
+
+    def __init__(
+        self,
+        bytes_processed: t.Optional[int],
+        total_bytes: t.Optional[int],
+        records_processed: int,
+        elapsed: float,
+    ) -> None:
+        self.bytes_processed = bytes_processed
+        self.total_bytes = total_bytes
+        self.records_processed = records_processed
+        self.elapsed = elapsed
+
+    @property
+    def fraction(self) -> t.Optional[float]:
+        """
+        Fraction of the file processed, between 0 and 1
+        """
+        if not self.total_bytes or self.bytes_processed is None:
+            return None
+        return min(self.bytes_processed / self.total_bytes, 1.0)
+
+    @property
+    def eta(self) -> t.Optional[float]:
+        """
+        Estimated seconds until the parse finishes
+        """
+        fraction = self.fraction
+        if not fraction:
+            return None
+        return self.elapsed * (1.0 - fraction) / fraction
+
+    def __repr__(self) -> str:
+        return (
+            f"ParseProgress(bytes={self.bytes_processed}/{self.total_bytes}, "
+            f"records={self.records_processed}, eta={self.eta})"
+        )
+
+
+class ParseFuture(Future):
+    """
+    Future returned by `parse_async`, resolving to the parsed log object.
+
+    Message types whose every record has been decoded are listed in
+    `completed_types` and can be read while the rest of the log is still
+    being parsed. Calling `cancel` on a running parse stops it at the next
+    progress checkpoint, `cancelled` then returns True and `result` raises
+    `CancelledError`.
+    """
+
+    def __init__(self, total_bytes: t.Optional[int] = None) -> None:
+        super().__init__()
+        self._total_bytes = total_bytes
+        self._bytes_processed: t.Optional[int] = None
+        self._records_processed = 0
+        self._started = time.monotonic()
+        self._cancel_requested = threading.Event()
+        self._completed_types: t.Set[str] = set()
+        self._stopped = False
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    @property
+    def completed_types(self) -> t.List[str]:
+        return list(self._completed_types)
+
+    def cancel(self) -> bool:
+        self._cancel_requested.set()
+        return super().cancel() or not self.done()
+
+    def cancelled(self) -> bool:
+        return super().cancelled() or self._stopped
+
+    def progress(self) -> ParseProgress:
+        return ParseProgress(
+            bytes_processed=self._bytes_processed,
+            total_bytes=self._total_bytes,
+            records_processed=self._records_processed,
+            elapsed=time.monotonic() - self._started,
+        )
+
+    def _update(self, bytes_processed: t.Optional[int], records_processed: int) -> None:
+        self._bytes_processed = bytes_processed
+        self._records_processed = records_processed
+
+    def _complete_type(self, name: str) -> None:
+        self._completed_types.add(name)
+
+    def _revoke_completed(self) -> None:
+        self._completed_types.clear()
+
+    def _stop(self) -> None:
+        """
+        Resolves a running future that was cancelled before it finished
+        """
+        self._stopped = True
+        self.set_exception(CancelledError())
@@ -0,0 +1,116 @@
+import typing as t
+
+import numpy as np
+
+
+class LodLevel(object):
+    """
+    One decimation level of a MinMaxPyramid, every bin covers 2**level samples
+    """
+
+    def __init__(
+        self, minimum: np.ndarray, maximum: np.ndarray, total: np.ndarray, count: np.ndarray
+    ) -> None:
+        self.min = minimum
+        self.max = maximum
+        self.sum = total
+        self.count = count
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.sum / self.count
+
+    def reduce(self) -> "LodLevel":
+        idx = np.arange(0, len(self.min), 2)
+        return LodLevel(
+            minimum=np.minimum.reduceat(self.min, idx),
+            maximum=np.maximum.reduceat(self.max, idx),
+            total=np.add.reduceat(self.sum, idx),
+            count=np.add.reduceat(self.count, idx),
+        )
+
+
+class MinMaxPyramid(object):
+    """
+    Level of detail index of a column: min/max/mean envelopes at power of two
+    decimation levels, so any time window can be drawn with a bounded number
+    of points regardless of the length of the series. Windows are half-open,
+    [t0, t1), like `MavLinkMessageSeries.slice`.
+    """
+
+    def __init__(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values must have the same length")
+        if timestamps.dtype == object:
+            timestamps = timestamps.astype("datetime64[us]")
+
+        self.timestamps = timestamps
+        self.values = np.asarray(values, dtype=float)
+        self.levels: t.List[LodLevel] = []
+
+        level = LodLevel(self.values, self.values, self.values, np.ones(len(self.values)))
+        while len(level.min) > 1:
+            level = level.reduce()
+            self.levels.append(level)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _window(self, t0, t1) -> t.Tuple[int, int]:
+        ts = self.timestamps
+        i0 = 0 if t0 is None else int(np.searchsorted(ts, np.asarray(t0, ts.dtype), "left"))
+        i1 = len(ts) if t1 is None else int(np.searchsorted(ts, np.asarray(t1, ts.dtype), "left"))
+        return i0, max(i0, i1)
+
+    def _level_for(self, n: int, pixels: int) -> int:
+        if pixels < 1:
+            raise ValueError(f"pixels should be higher than 0, {pixels}")
+        if n <= pixels:
+            return 0
+        return min(int(np.ceil(np.log2(n / pixels))), len(self.levels))
+
+    def _bins(self, i0: int, i1: int, pixels: int) -> t.Tuple[int, int, int]:
+        """
+        Returns the level and the range of its bins covering samples [i0, i1)
+        """
+        k = self._level_for(i1 - i0, pixels)
+        if k == 0:
+            return k, i0, i1
+        return k, i0 >> k, ((i1 - 1) >> k) + 1
+
+    def envelope(
+        self, t0=None, t1=None, pixels: int = 1000
+    ) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the start timestamp, min, max and mean of at most ~pixels bins
+        covering [t0, t1)
+        """
+        k, lo, hi = self._bins(*self._window(t0, t1), pixels)
+        if k == 0:
+            window = self.values[lo:hi]
+            return self.timestamps[lo:hi], window, window, window
+
+        level = self.levels[k - 1]
+        return (
+            self.timestamps[:: 1 << k][lo:hi],
+            level.min[lo:hi],
+            level.max[lo:hi],
+            # only the bins of the window are divided
+            level.sum[lo:hi] / level.count[lo:hi],
+        )
+
+    def render(self, t0=None, t1=None, pixels: int = 1000) -> t.Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns ~2*pixels (timestamp, value) points drawing the min/max envelope
+        of [t0, t1), or the raw samples when they already fit
+        """
+        i0, i1 = self._window(t0, t1)
+        if i1 - i0 <= 2 * pixels:
+            return self.timestamps[i0:i1], self.values[i0:i1]
+
+        k, lo, hi = self._bins(i0, i1, pixels)
+        level = self.levels[k - 1]
+        values = np.empty(2 * (hi - lo))
+        values[0::2] = level.min[lo:hi]
+        values[1::2] = level.max[lo:hi]
+        return np.repeat(self.timestamps[:: 1 << k][lo:hi], 2), values
@@ -0,0 +1,328 @@
+import os
+import typing as t
+from collections import OrderedDict
+
+import numpy as np
+
+from .core import MavLinkMessageSeries, MavLog, MavLogBase
+from .errors import EmptyLogError
+
+AGGREGATES: t.Dict[str, t.Callable[[np.ndarray], float]] = {
+    "min": np.min,
+    "max": np.max,
+    "mean": np.mean,
+    "std": np.std,
+    "sum": np.sum,
+    "count": len,
+    "first": lambda values: values[0],
+    "last": lambda values: values[-1],
+}
+
+LogEntry = t.Union[str, MavLogBase]
+
+
+def _seconds(timestamps: np.ndarray) -> np.ndarray:
+    if timestamps.dtype == object:
+        return np.array([ts.timestamp() for ts in timestamps], dtype=float)
+    return timestamps.astype(float)
+
+
+def _start(log: MavLogBase) -> float:
+    # the first record of any type, so the start does not depend on the types parsed
+    return log._first_timestamp or 0.0
+
+
+def _select_instance(
+    fields: t.Dict[str, np.ndarray],
+    name: str,
+    instance_column: t.Optional[str],
+    instance: t.Optional[int],
+) -> t.Dict[str, np.ndarray]:
+    if instance_column is None or instance_column not in fields:
+        return fields
+    ids = fields[instance_column]
+    if instance is None:
+        found = np.unique(ids)
+        if len(found) > 1:
+            raise ValueError(
+                f"{name} is logged for instances {found.tolist()}, pass instance= to pick one"
+            )
+        return fields
+    rows = ids == instance
+    return {key: values[rows] for key, values in fields.items()}
+
+
+def diff_series(
+    reference: MavLinkMessageSeries,
+    other: MavLinkMessageSeries,
+    columns: t.List[str] = None,
+    reference_start: float = 0.0,
+    other_start: float = 0.0,
+    instance_column: str = None,
+    instance: int = None,
+) -> t.Dict[str, np.ndarray]:
+    """
+    Aligns `other` on the timestamps of `reference` by linear interpolation and
+    returns `other - reference` for the numeric columns both series have.
+    Reference samples outside the time range of `other` are NaN. Messages
+    logged for several instances must be narrowed to one with `instance`.
+
+    ----
+    Parameters
+    ----
+
+        reference (MavLinkMessageSeries): The series to align on
+        other (MavLinkMessageSeries): The series compared to the reference
+        columns (List[str]): The columns to compare, all common numeric columns if None
+        reference_start (float): Subtracted from the reference timestamps
+        other_start (float): Subtracted from the other timestamps
+        instance_column (str): The column holding the instance of each record, if any
+        instance (int): Only compare the records of this instance
+
+    ----
+    Returns
+    ----
+        Dict[str, np.ndarray], with the aligned "timestamp" of the reference
+    """
+    ref_fields = _select_instance(reference.fields, reference.name, instance_column, instance)
+    other_fields = _select_instance(other.fields, other.name, instance_column, instance)
+    ref_t = _seconds(ref_fields["timestamp"]) - reference_start
+    other_t = _seconds(other_fields["timestamp"]) - other_start
+    if np.any(np.diff(other_t) < 0):
+        raise ValueError(f"the timestamps of {other.name} are not in increasing order")
+    outside = (ref_t < other_t[0]) | (ref_t > other_t[-1]) if len(other_t) else None
+
+    common = [
+        c for c in ref_fields if c not in ("timestamp", instance_column) and c in other_fields
+    ]
+    if columns is not None:
+        common = [c for c in common if c in columns]
+
+    diff = {"timestamp": ref_t}
+    for column in common:
+        ref_values = ref_fields[column]
+        other_values = other_fields[column]
+        numeric = np.issubdtype(ref_values.dtype, np.number)
+        if not numeric or not np.issubdtype(other_values.dtype, np.number):
+            continue
+        if len(other_t) == 0 or len(other_t) != len(other_values):
+            continue
+        aligned = np.interp(ref_t, other_t, other_values.astype(float))
+        aligned[outside] = np.nan
+        diff[column] = aligned - ref_values
+    return diff
+
+
+class LogCatalog(object):
+    """
+    A collection of logs queried together. Logs are given as paths, parsed
+    on demand with only the requested message and columns, or as already
+    parsed log objects. Per-log results are memoized, paths by their size and
+    modification time, so repeating a query only processes new or changed logs.
+    Up to MAX_RESULTS results are kept, the least recently used are dropped first.
+    """
+
+    MAX_RESULTS = 4096
+
+    def __init__(
+        self,
+        logs: t.Iterable[LogEntry] = (),
+        log_class: t.Type[MavLogBase] = MavLog,
+        **log_kwargs,
+    ) -> None:
+        self._log_class = log_class
+        self._log_kwargs = log_kwargs
+        self._logs: t.Dict[str, LogEntry] = {}
+        self._results: t.OrderedDict[tuple, t.Dict[str, t.Dict[str, float]]] = OrderedDict()
+        for log in logs:
+            self.add(log)
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+    @property
+    def names(self) -> t.List[str]:
+        return list(self._logs.keys())
+
+    def add(self, log: LogEntry, name: str = None) -> str:
+        """
+        Adds a log path or parsed log object, returns its name in the catalog
+        """
+        if name is None:
+            if isinstance(log, str):
+                name = log
+            elif isinstance(getattr(log, "_filepath", None), str):
+                name = log._filepath
+            else:
+                name = f"log{len(self._logs)}"
+        self._logs[name] = log
+        return name
+
+    def _identity(self, name: str) -> tuple:
+        log = self._logs[name]
+        if isinstance(log, str):
+            stat = os.stat(log)
+            return (os.path.abspath(log), stat.st_size, stat.st_mtime_ns)
+        # the key holds the log itself, so its id cannot be reused while it is cached
+        return ("object", log, log.message_count)
+
+    def _load(self, name: str, message: str, columns: t.Optional[t.List[str]]) -> MavLogBase:
+        log = self._logs[name]
+        if not isinstance(log, str):
+            return log
+        projection = {message: list(columns)} if columns is not None else None
+        parsed = self._log_class(log, types=[message], columns=projection, **self._log_kwargs)
+        parsed.parse()
+        return parsed
+
+    def _windows(
+        self,
+        log: MavLogBase,
+        series: MavLinkMessageSeries,
+        mode: t.Optional[str],
+        armed: t.Optional[bool],
+        t0: t.Optional[float],
+        t1: t.Optional[float],
+    ) -> t.List[t.Dict[str, np.ndarray]]:
+        start = _start(log)
+        lo = None if t0 is None else start + t0
+        hi = None if t1 is None else start + t1
+        if mode is None and armed is None:
+            return [series.slice(lo, hi)]
+
+        windows = []
+        for segment in log.segments(mode=mode, armed=armed):
+            s0 = segment.t0 if lo is None else max(segment.t0, lo)
+            s1 = segment.t1
+            if hi is not None:
+                s1 = hi if s1 is None else min(s1, hi)
+            if s1 is None or s1 > s0:
+                windows.append(series.slice(s0, s1))
+        return windows
+
+    def _aggregate_log(
+        self,
+        name: str,
+        message: str,
+        columns: t.Optional[t.List[str]],
+        funcs: t.Tuple[str, ...],
+        mode: t.Optional[str],
+        armed: t.Optional[bool],
+        t0: t.Optional[float],
+        t1: t.Optional[float],
+        instance: t.Optional[int],
+    ) -> t.Dict[str, t.Dict[str, float]]:
+        try:
+            log = self._load(name, message, columns)
+        except EmptyLogError:
+            return {}
+        series = log.get(message)
+        if series is None:
+            return {}
+
+        windows = self._windows(log, series, mode, armed, t0, t1)
+        keys = [k for k in series.raw_fields if k != "timestamp"]
+        merged = {
+            key: np.concatenate([w[key] for w in windows]) if windows else np.array([])
+            for key in keys
+        }
+        merged = _select_instance(merged, message, log._instance_column(message), instance)
+        if columns is not None:
+            keys = [k for k in keys if k in columns]
+
+        result = {}
+        for key in keys:
+            values = merged[key]
+            if not np.issubdtype(values.dtype, np.number):
+                continue
+            result[key] = {func: self._apply(func, values) for func in funcs}
+        return result
+
+    @staticmethod
+    def _apply(func: str, values: np.ndarray) -> t.Optional[float]:
+        if func == "count":
+            return len(values)
+        if len(values) == 0:
+            return None
+        return float(AGGREGATES[func](values))
+
+    def aggregate(
+        self,
+        message: str,
+        columns: t.List[str] = None,
+        funcs: t.Iterable[str] = ("max",),
+        mode: str = None,
+        armed: bool = None,
+        t0: float = None,
+        t1: float = None,
+        instance: int = None,
+    ) -> t.Dict[str, t.Dict[str, t.Dict[str, float]]]:
+        """
+        Computes aggregates of a message's columns for every log of the catalog
+
+        ----
+        Parameters
+        ----
+
+            message (str): The message type, e.g. "VIBE"
+            columns (List[str]): The columns to aggregate, all numeric columns if None
+            funcs (Iterable[str]): Aggregates to compute, any of min, max, mean,
+                std, sum, count, first and last
+            mode (str): Only keep the segments in this flight mode
+            armed (bool): Only keep the segments in this arming state
+            t0 (float): Start of the window, in seconds since the start of each log
+            t1 (float): End of the window, in seconds since the start of each log
+            instance (int): Only aggregate the records of this instance, required
+                for messages logged for several instances, e.g. IMU or BAT
+
+        ----
+        Returns
+        ----
+            {log name: {column: {func: value}}}
+        """
+        funcs = tuple(funcs)
+        unknown = [f for f in funcs if f not in AGGREGATES]
+        if unknown:
+            raise ValueError(f"unknown aggregates {unknown}, expected any of {list(AGGREGATES)}")
+        columns = None if columns is None else tuple(columns)
+        query = (message, columns, funcs, mode, armed, t0, t1, instance)
+
+        results = {}
+        for name in self._logs:
+            key = (self._identity(name),) + query
+            if key in self._results:
+                self._results.move_to_end(key)
+            else:
+                self._results[key] = self._aggregate_log(name, *query)
+                while len(self._results) > self.MAX_RESULTS:
+                    self._results.popitem(last=False)
+            results[name] = self._results[key]
+        return results
+
+    def diff(
+        self,
+        reference: str,
+        other: str,
+        message: str,
+        columns: t.List[str] = None,
+        instance: int = None,
+    ) -> t.Dict[str, np.ndarray]:
+        """
+        Returns `other - reference` for a message of two logs of the catalog,
+        aligned on the reference timestamps in seconds since the start of each log.
+        Messages logged for several instances need the `instance` to compare.
+        """
+        ref_log = self._load(reference, message, columns)
+        other_log = self._load(other, message, columns)
+        return diff_series(
+            ref_log[message],
+            other_log[message],
+            columns=columns,
+            reference_start=_start(ref_log),
+            other_start=_start(other_log),
+            instance_column=ref_log._instance_column(message),
+            instance=instance,
+        )
+
+    def clear_cache(self) -> None:
+        self._results.clear()
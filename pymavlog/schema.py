@@ -0,0 +1,45 @@
+import typing as t
+from datetime import datetime
+
+
+class SeriesSchema(object):
+    """
+    Layout of a MavLinkMessageSeries: the stored columns, their types and the
+    aliased keys they are stored under
+    """
+
+    def __init__(
+        self,
+        name: str,
+        columns: t.List[str],
+        types: t.List[type],
+        column_alias: t.Dict[str, str] = {},
+        convert_to_datetime: bool = False,
+    ) -> None:
+        self.name = name
+        self.msg_columns = tuple(columns)
+        self.msg_types = tuple(types)
+        self.column_alias = column_alias
+        self.convert_to_datetime = convert_to_datetime
+
+        self.columns = ("timestamp",) + self.msg_columns
+        self.types = (datetime if convert_to_datetime else float,) + self.msg_types
+        self.keys = self.columns
+        if column_alias:
+            # aliases are few, only their positions are replaced
+            keys = list(self.columns)
+            for column, key in column_alias.items():
+                if column in self.columns:
+                    keys[self.columns.index(column)] = key
+            self.keys = tuple(keys)
+        self._msg_pairs: t.Optional[t.Tuple[t.Tuple[str, str], ...]] = None
+
+    @property
+    def msg_pairs(self) -> t.Tuple[t.Tuple[str, str], ...]:
+        """
+        (column in the message, key in the series) for every message field,
+        only projected series need them so they are built on first use
+        """
+        if self._msg_pairs is None:
+            self._msg_pairs = tuple(zip(self.msg_columns, self.keys[1:]))
+        return self._msg_pairs
@@ -0,0 +1,131 @@
+import typing as t
+
+import numpy as np
+
+SEGMENT_MESSAGES = ("MODE", "EV", "ARM")
+
+# ArduPilot LogEvent ids
+EV_ARMED = 10
+EV_DISARMED = 11
+EV_AUTO_ARMED = 15
+
+
+class Segment(object):
+    """
+    A time interval of a log with a constant flight mode and arming state.
+    Indexing a segment with a message type returns the fields of that series
+    within the interval, as views of its numpy arrays.
+    """
+
+    def __init__(
+        self,
+        log,
+        t0: float,
+        t1: t.Optional[float],
+        mode: t.Optional[str],
+        armed: t.Optional[bool],
+    ) -> None:
+        self._log = log
+        self.t0 = t0
+        self.t1 = t1
+        self.mode = mode
+        self.armed = armed
+
+    @property
+    def duration(self) -> t.Optional[float]:
+        end = self.t1 if self.t1 is not None else self._log._end_timestamp
+        if end is None:
+            return None
+        return end - self.t0
+
+    def __getitem__(self, item: str) -> t.Dict[str, np.ndarray]:
+        return self._log[item].slice(self.t0, self.t1)
+
+    def get(self, key: str) -> t.Optional[t.Dict[str, np.ndarray]]:
+        series = self._log.get(key)
+        if series is None:
+            return None
+        return series.slice(self.t0, self.t1)
+
+    def __repr__(self) -> str:
+        return f"Segment(mode={self.mode!r}, armed={self.armed}, t0={self.t0}, t1={self.t1})"
+
+
+class SegmentIndex(object):
+    """
+    Timeline of flight mode and arming state changes, built from the MODE, ARM
+    and EV records seen while parsing
+    """
+
+    def __init__(self) -> None:
+        self._mode: t.Optional[str] = None
+        self._armed: t.Optional[bool] = None
+        self._changes: t.List[t.Tuple[float, t.Optional[str], t.Optional[bool]]] = []
+        self.events: t.List[t.Tuple[float, int]] = []
+
+    @staticmethod
+    def _mode_label(message, mlog) -> str:
+        # pymavlink resolves the mode name for the vehicle type when it reads MODE
+        flightmode = getattr(mlog, "flightmode", None)
+        if isinstance(flightmode, str) and flightmode != "UNKNOWN":
+            return flightmode
+        mode = getattr(message, "Mode", None)
+        if isinstance(mode, str):
+            return mode.upper()
+        return str(getattr(message, "ModeNum", mode))
+
+    def add_message(self, message, mlog=None) -> None:
+        timestamp = getattr(message, "_timestamp", None)
+        if timestamp is None:
+            return None
+
+        mode, armed = self._mode, self._armed
+        mtype = message.get_type()
+        if mtype == "MODE":
+            mode = self._mode_label(message, mlog)
+        elif mtype == "ARM":
+            armed = bool(message.ArmState)
+        elif mtype == "EV":
+            self.events.append((timestamp, message.Id))
+            if message.Id in (EV_ARMED, EV_AUTO_ARMED):
+                armed = True
+            elif message.Id == EV_DISARMED:
+                armed = False
+
+        if (mode, armed) != (self._mode, self._armed):
+            self._mode, self._armed = mode, armed
+            self._changes.append((timestamp, mode, armed))
+
+    def intervals(
+        self,
+    ) -> t.List[t.Tuple[float, t.Optional[float], t.Optional[str], t.Optional[bool]]]:
+        """
+        Returns (t0, t1, mode, armed) for every state, the last one is open ended
+        """
+        intervals = []
+        for idx, (t0, mode, armed) in enumerate(self._changes):
+            t1 = self._changes[idx + 1][0] if idx + 1 < len(self._changes) else None
+            intervals.append((t0, t1, mode, armed))
+        return intervals
+
+    def select(self, log, mode: str = None, armed: bool = None) -> t.List[Segment]:
+        """
+        Returns the segments matching the given mode and arming state, adjacent
+        matching intervals are merged
+        """
+        if mode is None and armed is None:
+            return [Segment(log, *interval) for interval in self.intervals()]
+
+        segments: t.List[Segment] = []
+        for t0, t1, m, a in self.intervals():
+            if mode is not None and (m is None or m.upper() != mode.upper()):
+                continue
+            if armed is not None and a != armed:
+                continue
+            if segments and segments[-1].t1 == t0:
+                segments[-1].t1 = t1
+                continue
+            segments.append(
+                Segment(log, t0, t1, m if mode else None, a if armed is not None else None)
+            )
+        return segments
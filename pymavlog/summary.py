@@ -0,0 +1,222 @@
+import mmap
+import os
+import struct
+import typing as t
+from functools import lru_cache
+
+from pymavlink.dialects.v20.ardupilotmega import mavlink_map
+
+from .compression import compression_of, open_source
+from .errors import EmptyLogError
+
+DF_HEAD = b"\xa3\x95"
+DF_HEADER_LEN = 3
+DF_FMT_TYPE = 0x80
+DF_FMT_STRUCT = struct.Struct("<BB4s16s64s")
+
+TLOG_TIMESTAMP = struct.Struct(">Q")
+MAVLINK_V1_MAGIC = 0xFE
+MAVLINK_V2_MAGIC = 0xFD
+MAVLINK_SIGNATURE_LEN = 13
+
+
+def _null_term(val: bytes) -> str:
+    return val.split(b"\x00", 1)[0].decode("ascii", errors="replace")
+
+
+class LogSummary(object):
+    """
+    Metadata of a log file, gathered by walking the record headers only
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        counts: t.Dict[str, int],
+        start_timestamp: t.Optional[float],
+        end_timestamp: t.Optional[float],
+        formats: t.Dict[str, t.Dict[str, t.Union[int, str, t.List[str]]]] = {},
+    ) -> None:
+        self.filepath = filepath
+        self.counts = counts
+        self.start_timestamp = start_timestamp
+        self.end_timestamp = end_timestamp
+        self.formats = formats
+
+    @property
+    def types(self) -> t.List[str]:
+        return list(self.counts.keys())
+
+    @property
+    def message_count(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def duration(self) -> t.Optional[float]:
+        if self.start_timestamp is None or self.end_timestamp is None:
+            return None
+        return self.end_timestamp - self.start_timestamp
+
+    def to_dict(self) -> dict:
+        return {
+            "filepath": self.filepath,
+            "counts": dict(self.counts),
+            "start_timestamp": self.start_timestamp,
+            "end_timestamp": self.end_timestamp,
+            "formats": dict(self.formats),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**data)
+
+    def __repr__(self) -> str:
+        return (
+            f"LogSummary(filepath={self.filepath!r}, types={len(self.counts)}, "
+            f"messages={self.message_count}, duration={self.duration})"
+        )
+
+
+def _scan_bin(data: t.Union[mmap.mmap, bytes], filepath: str) -> LogSummary:
+    """
+    Walks a DataFlash log. Only FMT bodies are decoded, for every other record
+    the message id is used to skip over the payload. Timestamps are the TimeUS
+    of the first and last timestamped records, in seconds since boot.
+    """
+    lengths: t.Dict[int, int] = {DF_FMT_TYPE: DF_HEADER_LEN + DF_FMT_STRUCT.size}
+    names: t.Dict[int, str] = {DF_FMT_TYPE: "FMT"}
+    timed: t.Dict[int, bool] = {}
+    formats: t.Dict[str, t.Dict[str, t.Union[int, str, t.List[str]]]] = {}
+    counts: t.Dict[str, int] = {}
+    first_timed = None
+    last_timed = None
+
+    data_len = len(data)
+    ofs = 0
+    while ofs + DF_HEADER_LEN <= data_len:
+        if data[ofs] != DF_HEAD[0] or data[ofs + 1] != DF_HEAD[1]:
+            ofs = data.find(DF_HEAD, ofs + 1)
+            if ofs == -1:
+                break
+            continue
+
+        mtype = data[ofs + 2]
+        mlen = lengths.get(mtype)
+        if mlen is None or mlen <= DF_HEADER_LEN:
+            # unknown type or bogus length, resync on the next header like pymavlink
+            ofs = data.find(DF_HEAD, ofs + 1)
+            if ofs == -1:
+                break
+            continue
+        if ofs + mlen > data_len:
+            # record cut off at the end of the file
+            break
+
+        if mtype == DF_FMT_TYPE:
+            ftype, flen, name, fmt, columns = DF_FMT_STRUCT.unpack_from(data, ofs + DF_HEADER_LEN)
+            name = _null_term(name)
+            fmt = _null_term(fmt)
+            columns = [c for c in _null_term(columns).split(",") if c]
+            lengths[ftype] = flen
+            names[ftype] = name
+            timed[ftype] = fmt[:1] == "Q" and columns[:1] == ["TimeUS"]
+            formats[name] = {"type": ftype, "length": flen, "format": fmt, "columns": columns}
+        elif timed.get(mtype):
+            if first_timed is None:
+                first_timed = ofs
+            last_timed = ofs
+
+        name = names[mtype]
+        counts[name] = counts.get(name, 0) + 1
+        ofs += mlen
+
+    start_timestamp = end_timestamp = None
+    if first_timed is not None:
+        start_timestamp = struct.unpack_from("<Q", data, first_timed + DF_HEADER_LEN)[0] * 1e-6
+        end_timestamp = struct.unpack_from("<Q", data, last_timed + DF_HEADER_LEN)[0] * 1e-6
+
+    return LogSummary(filepath, counts, start_timestamp, end_timestamp, formats)
+
+
+def _scan_tlog(data: t.Union[mmap.mmap, bytes], filepath: str) -> LogSummary:
+    """
+    Walks a telemetry log. Every record is a big endian timestamp in microseconds
+    followed by a MavLink v1/v2 packet, of which only the header is read.
+    """
+    counts: t.Dict[str, int] = {}
+    first_ofs = None
+    last_ofs = None
+
+    data_len = len(data)
+    ofs = 0
+    while ofs + TLOG_TIMESTAMP.size + 2 <= data_len:
+        pkt = ofs + TLOG_TIMESTAMP.size
+        magic = data[pkt]
+        plen = data[pkt + 1]
+        if magic == MAVLINK_V1_MAGIC:
+            msg_id = data[pkt + 5] if pkt + 6 <= data_len else None
+            size = 6 + plen + 2
+        elif magic == MAVLINK_V2_MAGIC and pkt + 10 <= data_len:
+            msg_id = data[pkt + 7] | data[pkt + 8] << 8 | data[pkt + 9] << 16
+            size = 10 + plen + 2
+            if data[pkt + 2] & 0x01:
+                size += MAVLINK_SIGNATURE_LEN
+        else:
+            ofs += 1
+            continue
+
+        if msg_id is None or pkt + size > data_len:
+            break
+
+        msg_cls = mavlink_map.get(msg_id)
+        if msg_cls is not None:
+            counts[msg_cls.msgname] = counts.get(msg_cls.msgname, 0) + 1
+            if first_ofs is None:
+                first_ofs = ofs
+            last_ofs = ofs
+        ofs = pkt + size
+
+    start_timestamp = end_timestamp = None
+    if first_ofs is not None:
+        start_timestamp = TLOG_TIMESTAMP.unpack_from(data, first_ofs)[0] * 1e-6
+        end_timestamp = TLOG_TIMESTAMP.unpack_from(data, last_ofs)[0] * 1e-6
+
+    return LogSummary(filepath, counts, start_timestamp, end_timestamp)
+
+
+SCANNERS = {"bin": _scan_bin, "tlog": _scan_tlog}
+
+
+@lru_cache(maxsize=256)
+def _inspect_cached(kind: str, filepath: str, size: int, mtime_ns: int) -> LogSummary:
+    if size == 0:
+        raise EmptyLogError(f"The log is empty: {filepath}")
+    if compression_of(filepath) is not None:
+        # no random access into compressed data, the records are scanned decompressed
+        with open_source(filepath) as f:
+            return SCANNERS[kind](f.read(), filepath)
+    with open(filepath, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return SCANNERS[kind](data, filepath)
+
+
+def inspect_log(filepath: str, kind: str) -> LogSummary:
+    """
+    Returns the LogSummary of a log file. Results are cached per file path,
+    size and modification time, so repeated calls on an unchanged file are free.
+
+    ----
+    Parameters
+    ----
+
+        filepath (str): path to the log file
+        kind (str): "bin" for DataFlash logs, "tlog" for telemetry logs
+
+    ----
+    Returns
+    ----
+        LogSummary
+    """
+    filepath = os.path.abspath(filepath)
+    stat = os.stat(filepath)
+    return _inspect_cached(kind, filepath, stat.st_size, stat.st_mtime_ns)
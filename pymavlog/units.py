@@ -0,0 +1,50 @@
+import typing as t
+
+from pymavlink.DFReader import DFFormat, DFMessage
+
+UNIT_MESSAGES = ("FMTU", "UNIT", "MULT")
+
+
+class UnitTable(object):
+    """
+    Collects the FMTU, UNIT and MULT definitions of a binary log, to scale
+    and annotate the parsed series once parsing has finished
+    """
+
+    def __init__(self) -> None:
+        self._units: t.Dict[str, str] = {}
+        self._mults: t.Dict[str, float] = {}
+        self._fmtu: t.Dict[int, t.Tuple[str, str]] = {}
+
+    def add_message(self, message: DFMessage) -> None:
+        mtype = message.get_type()
+        if mtype == "UNIT":
+            self._units[chr(message.Id)] = message.Label
+        elif mtype == "MULT":
+            # values are logged as single precision floats cast to double
+            self._mults[chr(message.Id)] = float("%.7g" % message.Mult)
+        elif mtype == "FMTU":
+            self._fmtu[message.FmtType] = (message.UnitIds, message.MultIds)
+
+    def columns_for(self, fmt: DFFormat) -> t.Tuple[t.Dict[str, str], t.Dict[str, float]]:
+        """
+        Returns the unit and multiplier of every column of a format. Columns that
+        already carry a multiplier in their format character are decoded scaled
+        by pymavlink, so they only get a unit.
+        """
+        units: t.Dict[str, str] = {}
+        multipliers: t.Dict[str, float] = {}
+        if fmt.type not in self._fmtu:
+            return units, multipliers
+
+        unit_ids, mult_ids = self._fmtu[fmt.type]
+        for idx, column in enumerate(fmt.columns):
+            if idx < len(unit_ids) and unit_ids[idx] in self._units:
+                units[column] = self._units[unit_ids[idx]]
+            if fmt.msg_mults[idx] is not None or idx >= len(mult_ids):
+                continue
+            mult = self._mults.get(mult_ids[idx])
+            # 0 marks dimensionless/unknown multipliers in ArduPilot logs
+            if mult and mult != 1.0:
+                multipliers[column] = mult
+        return units, multipliers
@@ -1,7 +1,9 @@
+import struct
 from unittest.mock import Mock
 
 import pytest
 from pymavlink.DFReader import DFFormat
+from pymavlink.dialects.v20 import ardupilotmega
 from pymavlink.dialects.v20.ardupilotmega import MAVLink_message
 from pymavlink.mavutil import mavserial
 
@@ -16,6 +18,8 @@ def mavlink_message():
         message = Mock()
         message._timestamp = timestamp
         message.get_type.return_value = msg_type
+        for k, v in content.items():
+            setattr(message, k, v)
         content["mavpackettype"] = msg_type
         message.to_dict.return_value = content
         return message
@@ -30,6 +34,7 @@ def mock_dfformat():
         mock_dfformat.name = name
         mock_dfformat.columns = columns
         mock_dfformat.msg_types = types
+        mock_dfformat.instance_field = None
         return mock_dfformat
 
     return wrapper
@@ -104,3 +109,117 @@ def mock_mavutil_tlog(mock_message_v2):
         "BATTERY_STATUS": mock_message_v2(name="BATTERY_STATUS"),
     }
     return mock_mavutil
+
+
+def df_fmt(ftype, length, name, fmt, columns):
+    body = struct.pack("<BB4s16s64s", ftype, length, name.encode(), fmt.encode(), columns.encode())
+    return b"\xa3\x95\x80" + body
+
+
+def df_record(mtype, fmt, *values):
+    return b"\xa3\x95" + bytes([mtype]) + struct.pack("<" + fmt, *values)
+
+
+@pytest.fixture
+def df_log(tmp_path):
+    def wrapper(formats, records, name="log.bin"):
+        data = df_fmt(0x80, 89, "FMT", "BBnNZ", "Type,Length,Name,Format,Columns")
+        for fmt in formats:
+            data += df_fmt(*fmt)
+        for record in records:
+            data += record if isinstance(record, bytes) else df_record(*record)
+        path = tmp_path / name
+        path.write_bytes(data)
+        return str(path)
+
+    return wrapper
+
+
+@pytest.fixture
+def bin_log(df_log):
+    return df_log(
+        formats=[(10, 3 + 12, "IMU", "Qf", "TimeUS,GyrX"), (11, 3 + 4, "PARM", "f", "Value")],
+        records=[
+            (10, "Qf", 1_000_000, 0.1),
+            (11, "f", 3.0),
+            b"\x00\x01",  # garbage between records
+            (10, "Qf", 3_500_000, 0.2),
+        ],
+    )
+
+
+@pytest.fixture
+def bin_log_corrupt(df_log):
+    records = [(10, "Qf", (i + 1) * 1_000_000, float(i)) for i in range(59)]
+    records.insert(1, b"\xa3\x95\x63")  # header of an unknown message type
+    return df_log(formats=[(10, 3 + 12, "IMU", "Qf", "TimeUS,GyrX")], records=records)
+
+
+@pytest.fixture
+def imu_instances_log(df_log):
+    def wrapper(name="imu.bin", offset=0.0):
+        # FMTU marks the I column as the instance ("#") of IMU
+        records = [(12, "QB16s16s", 0, 10, b"s#E", b"F--")]
+        for i in range(5):
+            for instance in (0, 1):
+                value = float(i) * (instance + 1) + offset
+                records.append((10, "QBf", (i + 1) * 1_000_000, instance, value))
+        return df_log(
+            formats=[
+                (10, 3 + 13, "IMU", "QBf", "TimeUS,I,GyrX"),
+                (12, 3 + 41, "FMTU", "QBNN", "TimeUS,FmtType,UnitIds,MultIds"),
+            ],
+            records=records,
+            name=name,
+        )
+
+    return wrapper
+
+
+@pytest.fixture
+def tlog(tmp_path):
+    mav = ardupilotmega.MAVLink(None, srcSystem=1, srcComponent=1)
+    data = b""
+    for i, msg in enumerate(
+        [
+            ardupilotmega.MAVLink_heartbeat_message(1, 3, 0, 0, 0, 3),
+            ardupilotmega.MAVLink_system_time_message(0, 0),
+            ardupilotmega.MAVLink_heartbeat_message(1, 3, 0, 0, 0, 3),
+        ]
+    ):
+        data += struct.pack(">Q", 1_700_000_000_000_000 + i * 500_000) + msg.pack(mav)
+    path = tmp_path / "log.tlog"
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.fixture
+def modes_log(df_log):
+    def wrapper(name="modes.bin", offset=0.0):
+        records = [(21, "QBBB", 0, 0, 0, 0)]  # MANUAL
+        for i in range(10):
+            records.append((10, "Qf", (i + 1) * 1_000_000, float(i) + offset))
+            if i == 1:
+                records.append((22, "QB", 2_500_000, 10))  # ARMED
+            if i == 2:
+                records.append((21, "QBBB", 3_500_000, 10, 10, 0))  # AUTO
+            if i == 5:
+                records.append((21, "QBBB", 6_500_000, 5, 5, 0))  # FBWA
+            if i == 7:
+                records.append((21, "QBBB", 8_500_000, 10, 10, 0))  # AUTO
+        return df_log(
+            formats=[
+                (10, 3 + 12, "IMU", "Qf", "TimeUS,GyrX"),
+                (21, 3 + 11, "MODE", "QMBB", "TimeUS,Mode,ModeNum,Rsn"),
+                (22, 3 + 9, "EV", "QB", "TimeUS,Id"),
+            ],
+            records=records,
+            name=name,
+        )
+
+    return wrapper
+
+
+@pytest.fixture
+def bin_log_modes(modes_log):
+    return modes_log()
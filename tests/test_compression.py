@@ -0,0 +1,80 @@
+import gzip
+import io
+import lzma
+
+import pytest
+
+from pymavlog.compression import BackgroundReader, compression_of, inner_extension, open_source
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("foo/bar.bin", None),
+        ("foo/bar.bin.gz", "gz"),
+        ("foo/bar.tlog.XZ", "xz"),
+        ("foo/bar.bin.zst", "zst"),
+        (io.BytesIO(gzip.compress(b"data")), "gz"),
+        (io.BytesIO(lzma.compress(b"data")), "xz"),
+        (io.BytesIO(b"\x28\xb5\x2f\xfd"), "zst"),
+        (io.BytesIO(b"\xa3\x95\x80"), None),
+    ],
+)
+def test_compression_of(source, expected):
+    assert compression_of(source) == expected
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("foo/bar.bin", ".bin"),
+        ("foo/bar.log.gz", ".log"),
+        ("foo/bar.LOG.xz", ".log"),
+        (io.BytesIO(b""), ""),
+    ],
+)
+def test_inner_extension(source, expected):
+    assert inner_extension(source) == expected
+
+
+def test_compression_of_keeps_position():
+    stream = io.BytesIO(gzip.compress(b"data"))
+    compression_of(stream)
+    assert stream.tell() == 0
+
+
+def test_open_source_decompresses():
+    assert open_source(io.BytesIO(gzip.compress(b"payload"))).read() == b"payload"
+
+
+def test_background_reader():
+    data = bytes(range(256)) * 100
+    reader = BackgroundReader(io.BytesIO(data), chunk_size=1000, max_chunks=2)
+
+    assert reader.read(10) == data[:10]
+    assert reader.read(1500) == data[10:1510]
+    assert reader.tell() == 1510
+    assert reader.read() == data[1510:]
+    assert reader.read(1) == b""
+    reader.close()
+
+
+def test_background_reader_propagates_errors():
+    class Broken(io.RawIOBase):
+        def readable(self):
+            return True
+
+        def read(self, size=-1):
+            raise OSError("corrupt")
+
+    reader = BackgroundReader(Broken())
+    with pytest.raises(OSError):
+        reader.read(1)
+    reader.close()
+
+
+def test_background_reader_close_before_eof():
+    reader = BackgroundReader(io.BytesIO(b"x" * 10_000), chunk_size=10, max_chunks=1)
+    reader.read(5)
+    reader.close()
+    assert reader.closed
@@ -0,0 +1,27 @@
+import pytest
+
+from pymavlog.futures import ParseFuture, ParseProgress
+
+
+def test_progress_eta():
+    progress = ParseProgress(bytes_processed=25, total_bytes=100, records_processed=3, elapsed=2.0)
+
+    assert progress.fraction == 0.25
+    assert progress.eta == pytest.approx(6.0)
+
+
+def test_progress_unknown_size():
+    progress = ParseProgress(
+        bytes_processed=None, total_bytes=None, records_processed=3, elapsed=2.0
+    )
+
+    assert progress.fraction is None
+    assert progress.eta is None
+
+
+def test_cancel_pending_future():
+    future = ParseFuture()
+
+    assert future.cancel()
+    assert future.cancel_requested
+    assert not future.set_running_or_notify_cancel()
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from pymavlog.lod import MinMaxPyramid
+
+
+@pytest.fixture
+def pyramid():
+    timestamps = np.arange(1000, dtype=float)
+    values = np.sin(timestamps / 10.0)
+    return MinMaxPyramid(timestamps, values)
+
+
+def test_levels(pyramid):
+    assert len(pyramid.levels) == 10
+    assert len(pyramid.levels[0].min) == 500
+    assert len(pyramid.levels[-1].min) == 1
+    assert pyramid.levels[-1].min[0] == pyramid.values.min()
+    assert pyramid.levels[-1].max[0] == pyramid.values.max()
+    assert pyramid.levels[-1].mean[0] == pytest.approx(pyramid.values.mean())
+
+
+def test_render_raw_when_window_fits(pyramid):
+    ts, values = pyramid.render(10, 20, pixels=100)
+
+    np.testing.assert_array_equal(ts, np.arange(10, 20))
+    np.testing.assert_array_equal(values, pyramid.values[10:20])
+
+
+def test_render_decimated(pyramid):
+    ts, values = pyramid.render(pixels=50)
+
+    assert len(ts) == len(values) <= 2 * 50 + 2
+    assert values.min() == pyramid.values.min()
+    assert values.max() == pyramid.values.max()
+    assert np.all(np.diff(ts) >= 0)
+
+
+def test_envelope_window(pyramid):
+    ts, minimum, maximum, mean = pyramid.envelope(100, 599, pixels=10)
+
+    assert len(ts) <= 11
+    assert ts[0] <= 100 and ts[-1] < 599
+    assert np.all(minimum <= mean) and np.all(mean <= maximum)
+
+
+def test_datetime_timestamps():
+    timestamps = np.array([datetime.fromtimestamp(100 + i) for i in range(8)], dtype=object)
+    lod = MinMaxPyramid(timestamps, np.arange(8))
+
+    ts, values = lod.render(datetime.fromtimestamp(102), datetime.fromtimestamp(104))
+    np.testing.assert_array_equal(values, [2, 3])
+
+
+def test_invalid_pixels(pyramid):
+    with pytest.raises(ValueError):
+        pyramid.envelope(pixels=0)
@@ -238,3 +238,98 @@ def test_series_does_not_reduce_parm(mavlink_message):
     series.append_message(msg_3)
 
     assert len(series.fields["timestamp"]) == 3
+
+
+def test_create_from_mavlink_format_projected(mock_dfformat):
+    dfformat = mock_dfformat()
+    series = MavLinkMessageSeries.from_df_format(fmt=dfformat, columns=["TestB"])
+
+    assert series.columns == ["timestamp", "TestB"]
+    assert set(series.raw_fields.keys()) == {"timestamp", "TestB"}
+
+
+def test_create_from_mavlink_format_projected_unknown_column(mock_dfformat):
+    with pytest.raises(InvalidFormatError):
+        MavLinkMessageSeries.from_df_format(fmt=mock_dfformat(), columns=["TestB", "TesB"])
+
+
+def test_create_from_message_projected(mock_message_v2):
+    msg = mock_message_v2()
+    series = MavLinkMessageSeries.from_message(msg, columns=["TestA"])
+
+    assert series.columns == ["timestamp", "TestA"]
+
+
+def test_append_message_projected(mavlink_message, mock_dfformat):
+    msg = mavlink_message("TEST", {"TimeUS": 123, "TestA": 22, "TestB": 0.121})
+    series = MavLinkMessageSeries.from_df_format(
+        fmt=mock_dfformat(), column_alias={"TestA": "a"}, columns=["TestA"]
+    )
+
+    series.append_message(msg)
+
+    msg.to_dict.assert_not_called()
+    np.testing.assert_array_equal(series["timestamp"], np.array([123]))
+    np.testing.assert_array_equal(series["a"], np.array([22]))
+    assert "TestB" not in series.fields
+
+
+def test_render(mavlink_message):
+    series = MavLinkMessageSeries(name="TEST", columns=["TimeUS", "TestA"], types=[int, float])
+    for i in range(1, 101):
+        series.append_message(mavlink_message("TEST", {"TimeUS": i, "TestA": i % 7}, timestamp=i))
+
+    ts, values = series.render("TestA", pixels=10)
+
+    assert len(values) <= 22
+    assert values.max() == 6
+
+    series.append_message(mavlink_message("TEST", {"TimeUS": 101, "TestA": 9}, timestamp=101))
+    ts, values = series.render("TestA", t0=90, pixels=10)
+    np.testing.assert_array_equal(ts, np.arange(90, 102))
+    assert values[-1] == 9
+
+
+def test_build_lod_converts_requested_columns(mavlink_message, monkeypatch):
+    series = MavLinkMessageSeries(name="TEST", columns=["TestA", "TestB"], types=[float, float])
+    for i in range(1, 11):
+        series.append_message(mavlink_message("TEST", {"TestA": i, "TestB": -i}, timestamp=i))
+
+    converted = []
+    to_numpy = MavLinkMessageSeries._to_numpy
+
+    def spy(self, key, dtype):
+        converted.append(key)
+        return to_numpy(self, key, dtype)
+
+    monkeypatch.setattr(MavLinkMessageSeries, "_to_numpy", spy)
+    ts, values = series.render("TestA", t0=3, t1=6)
+
+    assert converted == ["timestamp", "TestA"]
+    np.testing.assert_array_equal(ts, [3, 4, 5])
+
+
+def test_set_units_resets_lod(mavlink_message):
+    series = MavLinkMessageSeries(name="TEST", columns=["TestA"], types=[int])
+    for i in range(1, 5):
+        series.append_message(mavlink_message("TEST", {"TestA": i * 100}, timestamp=i))
+    series.build_lod(["TestA"])
+
+    series.set_units({"TestA": "deg"}, {"TestA": 0.01})
+    ts, values = series.render("TestA")
+
+    np.testing.assert_allclose(values, [1.0, 2.0, 3.0, 4.0])
+
+
+def test_slice(mavlink_message):
+    series = MavLinkMessageSeries(name="TEST", columns=["TimeUS", "TestA"], types=[int, float])
+    for i in range(1, 11):
+        series.append_message(mavlink_message("TEST", {"TimeUS": i, "TestA": i * 2}, timestamp=i))
+
+    window = series.slice(3, 6)
+    np.testing.assert_array_equal(window["timestamp"], [3, 4, 5])
+    np.testing.assert_array_equal(window["TestA"], [6, 8, 10])
+    assert window["TestA"].base is series.slice()["TestA"].base
+
+    series.append_message(mavlink_message("TEST", {"TimeUS": 11, "TestA": 22}, timestamp=11))
+    np.testing.assert_array_equal(series.slice(10)["TestA"], [20, 22])
@@ -1,9 +1,17 @@
+import gzip
+import io
+import itertools
+import lzma
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from datetime import datetime
 
+import numpy as np
 import pytest
 
 from pymavlog import MavLinkMessageSeries, MavLog, core
 from pymavlog.errors import EmptyLogError
+from pymavlog.futures import ParseFuture
 
 
 def test_types(mavlink_message, mock_mavutil, monkeypatch):
@@ -105,3 +113,240 @@ def test_getitem(mock_mavutil, monkeypatch, mavlink_message):
     series = mlog["GPS"]
 
     assert isinstance(series, MavLinkMessageSeries)
+
+
+def test_parse_with_columns(mavlink_message, mock_mavutil, monkeypatch):
+    mock_mavutil.mavlink_connection().recv_msg.side_effect = [
+        mavlink_message(),
+        mavlink_message(
+            msg_type="GPS", content={"TimeUS": 222, "Lat": 0.22, "Lon": 0.121}, timestamp=222
+        ),
+        None,
+    ]
+
+    monkeypatch.setattr(core, "mavutil", mock_mavutil)
+
+    mlog = MavLog(filepath="foo/bar.bin", columns={"GPS": ["Lat"]})
+    mlog.parse()
+
+    assert mlog["GPS"].columns == ["timestamp", "Lat"]
+    assert mlog["GPS"]["Lat"][0] == 0.22
+    assert mlog["TEST"].columns == ["timestamp", "TimeUS", "TestA", "TestB"]
+
+
+def test_parse_async(bin_log):
+    mlog = MavLog(filepath=bin_log)
+    future = mlog.parse_async()
+
+    assert future.result(timeout=10) is mlog
+    assert mlog.message_count == 3
+    assert sorted(future.completed_types) == ["IMU", "PARM"]
+    assert list(mlog["IMU"]["GyrX"]) == pytest.approx([0.1, 0.2])
+
+    progress = future.progress()
+    assert progress.records_processed == 6
+    assert progress.fraction == 1.0
+    assert progress.eta == 0.0
+
+
+def test_parse_async_with_executor(bin_log):
+    mlog = MavLog(filepath=bin_log)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = mlog.parse_async(executor=executor)
+        assert future.result(timeout=10) is mlog
+
+
+def test_parse_async_propagates_errors(mock_mavutil, monkeypatch):
+    mock_mavutil.mavlink_connection().recv_msg.side_effect = RuntimeError("corrupt")
+    monkeypatch.setattr(core, "mavutil", mock_mavutil)
+
+    future = MavLog(filepath="foo/bar.bin").parse_async()
+
+    with pytest.raises(RuntimeError):
+        future.result(timeout=10)
+
+
+def _parse_tracking_completion(mlog, monkeypatch):
+    future = ParseFuture()
+    completed_at_append = []
+    append_message = MavLinkMessageSeries.append_message
+
+    def spy(series, message):
+        completed_at_append.append(series.name in future.completed_types)
+        append_message(series, message)
+
+    monkeypatch.setattr(MavLinkMessageSeries, "append_message", spy)
+    mlog._parse(future)
+    return future, completed_at_append
+
+
+def test_parse_async_completes_type_after_last_record(bin_log_corrupt, monkeypatch):
+    mlog = MavLog(filepath=bin_log_corrupt)
+    future, completed_at_append = _parse_tracking_completion(mlog, monkeypatch)
+
+    assert completed_at_append == [False] * 59
+    assert future.completed_types == ["IMU"]
+
+
+def test_parse_async_revokes_completion_on_extra_records(bin_log_corrupt, monkeypatch):
+    monkeypatch.setattr(MavLog, "_expected_counts", lambda self: {"IMU": 1})
+    mlog = MavLog(filepath=bin_log_corrupt)
+    future, completed_at_append = _parse_tracking_completion(mlog, monkeypatch)
+
+    assert completed_at_append == [False] * 59
+    assert future.completed_types == ["IMU"]
+
+
+def test_parse_async_cancel(mavlink_message, mock_mavutil, monkeypatch):
+    assigned = threading.Event()
+
+    def messages():
+        assigned.wait(timeout=10)
+        for i in itertools.count():
+            if i == 10:
+                future.cancel()
+            yield mavlink_message(timestamp=i)
+
+    mock_mavutil.mavlink_connection().recv_msg.side_effect = messages()
+    monkeypatch.setattr(core, "mavutil", mock_mavutil)
+    monkeypatch.setattr(MavLog, "PROGRESS_INTERVAL", 5)
+
+    mlog = MavLog(filepath="foo/bar.bin")
+    future = mlog.parse_async()
+    assigned.set()
+
+    with pytest.raises(CancelledError):
+        future.result(timeout=10)
+    assert mlog.message_count < 20
+    assert future.completed_types == []
+    assert future.cancelled()
+    mock_mavutil.mavlink_connection().close.assert_called_once()
+
+
+@pytest.fixture
+def bin_log_units(df_log):
+    return df_log(
+        formats=[
+            (12, 76, "UNIT", "QbZ", "TimeUS,Id,Label"),
+            (13, 20, "MULT", "Qbd", "TimeUS,Id,Mult"),
+            (14, 44, "FMTU", "QBNN", "TimeUS,FmtType,UnitIds,MultIds"),
+            (15, 15, "ATT", "Qhc", "TimeUS,Roll,Pitch"),
+        ],
+        records=[
+            (12, "Qb64s", 0, ord("s"), b"s"),
+            (12, "Qb64s", 0, ord("d"), b"deg"),
+            (13, "Qbd", 0, ord("F"), 1e-6),
+            (13, "Qbd", 0, ord("B"), 1e-2),
+            (13, "Qbd", 0, ord("-"), 0),
+            (14, "QB16s16s", 0, 15, b"sdd", b"FB-"),
+            (15, "Qhh", 1_000_000, 1050, 250),
+            (15, "Qhh", 2_000_000, -300, -100),
+        ],
+    )
+
+
+def test_parse_apply_units(bin_log_units):
+    mlog = MavLog(filepath=bin_log_units, apply_units=True)
+    mlog.parse()
+
+    att = mlog["ATT"]
+    np.testing.assert_allclose(att["TimeUS"], [1.0, 2.0])
+    np.testing.assert_allclose(att["Roll"], [10.5, -3.0])
+    np.testing.assert_allclose(att["Pitch"], [2.5, -1.0])
+    assert att.units == {"TimeUS": "s", "Roll": "deg", "Pitch": "deg"}
+    assert att.raw_fields["Roll"] == [1050, -300]
+
+
+def test_parse_without_units(bin_log_units):
+    mlog = MavLog(filepath=bin_log_units)
+    mlog.parse()
+
+    np.testing.assert_array_equal(mlog["ATT"]["Roll"], [1050, -300])
+    assert mlog["ATT"].units == {}
+
+
+@pytest.mark.parametrize("suffix,compress", [(".gz", gzip.compress), (".xz", lzma.compress)])
+def test_parse_compressed(bin_log, tmp_path, suffix, compress):
+    path = tmp_path / ("log.bin" + suffix)
+    with open(bin_log, "rb") as f:
+        path.write_bytes(compress(f.read()))
+
+    mlog = MavLog(filepath=str(path))
+    mlog.parse()
+
+    assert mlog.message_count == 3
+    np.testing.assert_allclose(mlog["IMU"]["GyrX"], [0.1, 0.2])
+    assert MavLog.inspect(str(path)).counts == MavLog.inspect(bin_log).counts
+
+
+@pytest.mark.parametrize("suffix,compress", [("", bytes), (".gz", gzip.compress)])
+def test_parse_text_log(tmp_path, suffix, compress):
+    text = (
+        "FMT, 128, 89, FMT, BBnNZ, Type,Length,Name,Format,Columns\n"
+        "FMT, 10, 15, IMU, Qf, TimeUS,GyrX\n"
+        "IMU, 1000000, 0.1\n"
+        "IMU, 2000000, 0.2\n"
+    )
+    path = tmp_path / ("log.log" + suffix)
+    path.write_bytes(compress(text.encode()))
+
+    mlog = MavLog(filepath=str(path))
+    future = mlog.parse_async()
+
+    assert future.result(timeout=10).message_count == 2
+    np.testing.assert_allclose(mlog["IMU"]["GyrX"], [0.1, 0.2])
+
+
+def test_parse_file_object(bin_log):
+    with open(bin_log, "rb") as f:
+        stream = io.BytesIO(gzip.compress(f.read()))
+
+    mlog = MavLog(filepath=stream)
+    future = mlog.parse_async()
+
+    assert future.result(timeout=10).message_count == 3
+    assert future.progress().fraction == 1.0
+    assert not stream.closed
+
+
+def test_segments(bin_log_modes):
+    mlog = MavLog(filepath=bin_log_modes)
+    mlog.parse()
+
+    segments = mlog.segments()
+    assert [(s.mode, s.armed) for s in segments] == [
+        ("MANUAL", None),
+        ("MANUAL", True),
+        ("AUTO", True),
+        ("FBWA", True),
+        ("AUTO", True),
+    ]
+    assert mlog.events == [(pytest.approx(2.5), 10)]
+
+    auto = mlog.segments(mode="auto")
+    assert len(auto) == 2
+    assert auto[0].duration == pytest.approx(3.0)
+    np.testing.assert_array_equal(auto[0]["IMU"]["GyrX"], [3.0, 4.0, 5.0])
+    np.testing.assert_array_equal(auto[1]["IMU"]["GyrX"], [8.0, 9.0])
+    assert auto[0].get("FOO") is None
+
+    armed = mlog.segments(armed=True)
+    assert len(armed) == 1
+    assert armed[0]["IMU"]["GyrX"][0] == 2.0
+
+
+def test_segments_are_views(bin_log_modes):
+    mlog = MavLog(filepath=bin_log_modes)
+    mlog.parse()
+
+    gyr_x = mlog.segments(mode="AUTO")[0]["IMU"]["GyrX"]
+    assert gyr_x.base is not None
+    assert gyr_x.base is mlog.segments(mode="FBWA")[0]["IMU"]["GyrX"].base
+
+
+def test_projection_keeps_instance_column(imu_instances_log):
+    mlog = MavLog(imu_instances_log(), types=["IMU"], columns={"IMU": ["GyrX"]})
+    mlog.parse()
+
+    assert mlog["IMU"].columns == ["timestamp", "I", "GyrX"]
+    assert mlog._instance_column("IMU") == "I"
@@ -1,3 +1,9 @@
+import gc
+import gzip
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from pymavlog import EmptyLogError, MavLinkMessageSeries, MavTLog, core
@@ -22,3 +28,68 @@ def test_types_empty_error(mavlink_message, mock_mavutil_tlog, monkeypatch):
     monkeypatch.setattr(core, "mavutil", mock_mavutil_tlog)
     with pytest.raises(EmptyLogError):
         MavTLog(filepath="foo/bar.bin", types=[])
+
+
+def test_parse_compressed(tlog, tmp_path):
+    path = tmp_path / "log.tlog.gz"
+    with open(tlog, "rb") as f:
+        path.write_bytes(gzip.compress(f.read()))
+
+    mlog = MavTLog(filepath=str(path), messages_to_ignore=[])
+    mlog.parse()
+
+    assert sorted(mlog.types) == ["HEARTBEAT", "SYSTEM_TIME"]
+    assert mlog.message_count == 3
+    assert len(mlog["HEARTBEAT"]["type"]) == 2
+    assert mlog.start_timestamp == pytest.approx(1_700_000_000.0)
+    assert mlog.end_timestamp == pytest.approx(1_700_000_001.0)
+
+
+def test_parse_compressed_types(tlog):
+    with open(tlog, "rb") as f:
+        stream = io.BytesIO(gzip.compress(f.read()))
+
+    mlog = MavTLog(filepath=stream, types=["SYSTEM_TIME"])
+    mlog.parse()
+
+    assert mlog.types == ["SYSTEM_TIME"]
+    assert mlog.message_count == 1
+
+
+@pytest.fixture
+def tlog_gz(tlog, tmp_path):
+    path = tmp_path / "log.tlog.gz"
+    with open(tlog, "rb") as f:
+        path.write_bytes(gzip.compress(f.read()))
+    return str(path)
+
+
+def test_close_stops_reader(tlog_gz):
+    with MavTLog(filepath=tlog_gz) as mlog:
+        reader = mlog._mlog.f
+        assert reader._thread.is_alive()
+
+    assert reader.closed
+    assert not reader._thread.is_alive()
+
+
+def test_reader_stopped_when_collected(tlog_gz):
+    reader = MavTLog(filepath=tlog_gz)._mlog.f
+    gc.collect()
+
+    assert reader.closed
+    assert not reader._thread.is_alive()
+
+
+def test_cancelled_parse_closes_log(tlog_gz):
+    mlog = MavTLog(filepath=tlog_gz)
+    reader = mlog._mlog.f
+    release = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(release.wait, 10)
+        future = mlog.parse_async(executor=executor)
+        future.cancel()
+        release.set()
+
+    assert future.cancelled()
+    assert reader.closed
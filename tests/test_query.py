@@ -0,0 +1,168 @@
+import numpy as np
+import pytest
+
+from pymavlog import LogCatalog, MavLog, diff_series
+
+
+@pytest.fixture
+def catalog(modes_log):
+    return LogCatalog([modes_log("a.bin"), modes_log("b.bin", offset=1.0)])
+
+
+def test_aggregate(catalog, modes_log):
+    results = catalog.aggregate("IMU", ["GyrX"], funcs=["min", "max", "count"])
+
+    assert results[modes_log("a.bin")] == {"GyrX": {"min": 0.0, "max": 9.0, "count": 10}}
+    assert results[modes_log("b.bin", offset=1.0)]["GyrX"]["max"] == 10.0
+
+
+def test_aggregate_segments_and_window(catalog):
+    by_mode = catalog.aggregate("IMU", ["GyrX"], funcs=["mean", "count"], mode="AUTO")
+    assert list(by_mode.values())[0]["GyrX"] == {"mean": pytest.approx(5.8), "count": 5}
+
+    window = catalog.aggregate("IMU", ["GyrX"], funcs=["first", "last"], t0=2.0, t1=5.0)
+    assert list(window.values())[0]["GyrX"] == {"first": 2.0, "last": 4.0}
+
+
+def test_aggregate_is_memoized(catalog, monkeypatch):
+    catalog.aggregate("IMU", ["GyrX"])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("log parsed again")
+
+    monkeypatch.setattr(catalog, "_load", fail)
+    catalog.aggregate("IMU", ["GyrX"])
+
+
+def test_aggregate_missing_message(catalog):
+    assert all(r == {} for r in catalog.aggregate("GPS").values())
+
+
+def test_aggregate_invalid_func(catalog):
+    with pytest.raises(ValueError):
+        catalog.aggregate("IMU", funcs=["median"])
+
+
+def test_aggregate_parsed_log(bin_log_modes):
+    mlog = MavLog(bin_log_modes)
+    mlog.parse()
+    catalog = LogCatalog()
+    name = catalog.add(mlog, name="flight")
+
+    assert catalog.names == ["flight"]
+    assert catalog.aggregate("IMU", ["GyrX"])[name] == {"GyrX": {"max": 9.0}}
+
+
+def test_aggregate_window_starts_at_first_record(df_log):
+    path = df_log(
+        formats=[
+            (10, 3 + 12, "IMU", "Qf", "TimeUS,GyrX"),
+            (11, 3 + 12, "BAT", "Qf", "TimeUS,Volt"),
+        ],
+        records=[(11, "Qf", 1_000_000, 12.0)]
+        + [(10, "Qf", (5 + i) * 1_000_000, float(i)) for i in range(3)],
+    )
+    mlog = MavLog(path)
+    mlog.parse()
+    catalog = LogCatalog([path])
+    catalog.add(mlog, name="parsed")
+
+    for t0, t1, expected in [(0, 2, None), (3, 5, 0.0), (4, 10, 2.0)]:
+        results = catalog.aggregate("IMU", ["GyrX"], funcs=["max"], t0=t0, t1=t1)
+        assert results[path] == results["parsed"] == {"GyrX": {"max": expected}}
+
+
+def test_aggregate_results_are_bounded(catalog, monkeypatch):
+    monkeypatch.setattr(LogCatalog, "MAX_RESULTS", 3)
+    for func in ["min", "max", "mean"]:
+        catalog.aggregate("IMU", ["GyrX"], funcs=[func])
+
+    assert len(catalog._results) == 3
+
+
+def test_diff(catalog):
+    reference, other = catalog.names
+    diff = catalog.diff(reference, other, "IMU", ["GyrX"])
+
+    np.testing.assert_allclose(diff["GyrX"], np.ones(10))
+    np.testing.assert_allclose(diff["timestamp"], np.arange(10))
+
+
+def test_diff_series_interpolates(mavlink_message):
+    from pymavlog import MavLinkMessageSeries
+
+    reference = MavLinkMessageSeries("TEST", ["TestA"], [float])
+    other = MavLinkMessageSeries("TEST", ["TestA"], [float])
+    for i in (1, 2, 3):
+        reference.append_message(mavlink_message("TEST", {"TestA": float(i)}, timestamp=i))
+    for i in (1, 3):
+        other.append_message(mavlink_message("TEST", {"TestA": float(i) * 2}, timestamp=i))
+
+    diff = diff_series(reference, other)
+    np.testing.assert_allclose(diff["TestA"], [1.0, 2.0, 3.0])
+
+
+def _series(mavlink_message, timestamps, values):
+    from pymavlog import MavLinkMessageSeries
+
+    series = MavLinkMessageSeries("TEST", ["TestA"], [float])
+    for ts, value in zip(timestamps, values):
+        series.append_message(mavlink_message("TEST", {"TestA": value}, timestamp=ts))
+    return series
+
+
+def test_diff_series_outside_other_range_is_nan(mavlink_message):
+    reference = _series(mavlink_message, [1, 2, 3, 4], [0.0, 0.0, 0.0, 0.0])
+    other = _series(mavlink_message, [2, 3], [5.0, 7.0])
+
+    diff = diff_series(reference, other)
+    np.testing.assert_array_equal(diff["TestA"], [np.nan, 5.0, 7.0, np.nan])
+
+
+def test_diff_series_requires_increasing_timestamps(mavlink_message):
+    reference = _series(mavlink_message, [1, 2], [0.0, 0.0])
+    other = _series(mavlink_message, [1, 3, 2], [1.0, 2.0, 3.0])
+
+    with pytest.raises(ValueError):
+        diff_series(reference, other)
+
+
+def test_diff_series_allows_repeated_timestamps(mavlink_message):
+    reference = _series(mavlink_message, [1, 2, 3], [0.0, 0.0, 0.0])
+    other = _series(mavlink_message, [1, 2, 2, 3], [1.0, 2.0, 2.0, 3.0])
+
+    diff = diff_series(reference, other)
+    np.testing.assert_allclose(diff["TestA"], [1.0, 2.0, 3.0])
+
+
+@pytest.fixture
+def instances_catalog(imu_instances_log):
+    return LogCatalog([imu_instances_log("a.bin"), imu_instances_log("b.bin", offset=1.0)])
+
+
+def test_aggregate_instances(instances_catalog, imu_instances_log):
+    with pytest.raises(ValueError, match=r"instances \[0, 1\]"):
+        instances_catalog.aggregate("IMU", ["GyrX"])
+
+    first = instances_catalog.aggregate("IMU", ["GyrX"], funcs=["max", "count"], instance=0)
+    second = instances_catalog.aggregate("IMU", ["GyrX"], funcs=["max", "count"], instance=1)
+
+    assert first[imu_instances_log("a.bin")] == {"GyrX": {"max": 4.0, "count": 5}}
+    assert second[imu_instances_log("a.bin")] == {"GyrX": {"max": 8.0, "count": 5}}
+
+
+def test_diff_instances(instances_catalog):
+    reference, other = instances_catalog.names
+    with pytest.raises(ValueError, match="pass instance="):
+        instances_catalog.diff(reference, other, "IMU", ["GyrX"])
+
+    diff = instances_catalog.diff(reference, other, "IMU", ["GyrX"], instance=1)
+
+    assert list(diff) == ["timestamp", "GyrX"]
+    np.testing.assert_allclose(diff["GyrX"], np.ones(5))
+    np.testing.assert_allclose(diff["timestamp"], np.arange(5))
+
+
+def test_aggregate_empty_columns_are_not_all_columns(catalog):
+    assert all(r == {} for r in catalog.aggregate("IMU", []).values())
+    assert all("GyrX" in r for r in catalog.aggregate("IMU").values())
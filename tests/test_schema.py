@@ -0,0 +1,25 @@
+from pymavlog import MavLinkMessageSeries
+from pymavlog.schema import SeriesSchema
+
+
+def test_schema_layout():
+    schema = SeriesSchema("TEST", ["TimeUS", "TestA"], [int, float], {"TestA": "a", "Other": "o"})
+
+    assert schema.columns == ("timestamp", "TimeUS", "TestA")
+    assert schema.keys == ("timestamp", "TimeUS", "a")
+    assert schema.msg_pairs == (("TimeUS", "TimeUS"), ("TestA", "a"))
+
+
+def test_schema_without_alias():
+    schema = SeriesSchema("TEST", ["TimeUS", "TestA"], [int, float])
+
+    assert schema.keys == schema.columns
+    assert schema.types == (float, int, float)
+
+
+def test_series_columns_are_copies(mock_dfformat):
+    series = MavLinkMessageSeries.from_df_format(mock_dfformat())
+
+    series.columns.append("Extra")
+
+    assert series.columns == ["timestamp", "TimeUS", "TestA", "TestB"]
@@ -0,0 +1,53 @@
+import pytest
+
+from pymavlog import EmptyLogError, LogSummary, MavLog, MavTLog
+
+
+def test_inspect_bin(bin_log):
+    summary = MavLog.inspect(bin_log)
+
+    assert isinstance(summary, LogSummary)
+    assert summary.counts == {"FMT": 3, "IMU": 2, "PARM": 1}
+    assert summary.message_count == 6
+    assert summary.start_timestamp == 1.0
+    assert summary.end_timestamp == 3.5
+    assert summary.duration == 2.5
+    assert summary.formats["IMU"]["columns"] == ["TimeUS", "GyrX"]
+    assert summary.formats["IMU"]["format"] == "Qf"
+
+
+def test_inspect_bin_resyncs_after_corrupt_header(bin_log_corrupt):
+    summary = MavLog.inspect(bin_log_corrupt)
+    mlog = MavLog(bin_log_corrupt)
+    mlog.parse()
+
+    assert summary.counts["IMU"] == len(mlog["IMU"].raw_fields["GyrX"]) == 59
+    assert summary.end_timestamp == 59.0
+
+
+def test_inspect_tlog(tlog):
+    summary = MavTLog.inspect(tlog)
+
+    assert summary.counts == {"HEARTBEAT": 2, "SYSTEM_TIME": 1}
+    assert summary.start_timestamp == 1_700_000_000.0
+    assert summary.duration == 1.0
+    assert summary.formats == {}
+
+
+def test_inspect_is_cached(bin_log):
+    assert MavLog.inspect(bin_log) is MavLog.inspect(bin_log)
+
+
+def test_summary_roundtrip(bin_log):
+    summary = MavLog.inspect(bin_log)
+    restored = LogSummary.from_dict(summary.to_dict())
+
+    assert restored.counts == summary.counts
+    assert restored.duration == summary.duration
+
+
+def test_inspect_empty_raises(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    with pytest.raises(EmptyLogError):
+        MavLog.inspect(str(path))